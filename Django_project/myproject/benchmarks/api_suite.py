@@ -0,0 +1,268 @@
+"""
+Benchmark the blog API in-process and compare against stored baselines.
+
+Seeds a throwaway test database with authors, tags and posts, then drives
+the DRF endpoints through the test client and reports, per scenario:
+- throughput (calls/s) and latency percentiles
+- SQL queries per call (recorded with QueryRecorder)
+
+Scenarios: post_list, post_retrieve, post_create, tag_list, token.
+
+    python benchmarks/api_suite.py --posts 1000 --iterations 50
+    python benchmarks/api_suite.py --save-baseline      # record numbers
+    python benchmarks/api_suite.py --check              # fail on regressions
+    python benchmarks/api_suite.py --profile profiles/  # one .prof per scenario
+
+Query counts are compared exactly; latencies may exceed the baseline by
+--tolerance before a scenario counts as regressed. List responses are
+cached per ETag, so the cache is cleared before every call unless
+--warm-cache is given; that way the numbers track serializer and queryset
+cost. Profiles are standard cProfile output, e.g. for
+`snakeviz profiles/post_list.prof` or `flameprof profiles/post_list.prof`.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from blogapp.middleware import QueryRecorder  # noqa: E402
+from blogapp.models import Author, Post, Tag  # noqa: E402
+
+
+DEFAULT_BASELINE = BASE_DIR / 'benchmarks' / 'baselines' / 'api_suite.json'
+PASSWORD = 'benchmark-password'
+
+# Keep throttles (their upsert is part of every request) but never reject
+BENCHMARK_REST_FRAMEWORK = {
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'anon': '1000000/s', 'user': '1000000/s'},
+}
+
+
+def seed(authors, tags, posts, tags_per_post):
+    """
+    Bulk-insert the benchmark data set and return the authors.
+    """
+    password = make_password(PASSWORD)
+    Author.objects.bulk_create(
+        [
+            Author(username=f'author{i}', email=f'author{i}@example.com', password=password)
+            for i in range(authors)
+        ],
+        batch_size=500
+    )
+    author_ids = list(Author.objects.order_by('id').values_list('id', flat=True))
+
+    Tag.objects.bulk_create(
+        [Tag(name=f'tag{i}', created_by_id=author_ids[i % authors]) for i in range(tags)],
+        batch_size=500
+    )
+    tag_ids = list(Tag.objects.order_by('id').values_list('id', flat=True))
+
+    Post.objects.bulk_create(
+        [
+            Post(
+                title=f'Post {i}',
+                content=f'Benchmark content for post {i}. ' * 10,
+                author_id=author_ids[i % authors]
+            )
+            for i in range(posts)
+        ],
+        batch_size=500
+    )
+    Through = Post.tags.through
+    Through.objects.bulk_create(
+        [
+            Through(post_id=post_id, tag_id=tag_ids[(post_id + offset) % len(tag_ids)])
+            for post_id in Post.objects.values_list('id', flat=True)
+            for offset in range(min(tags_per_post, len(tag_ids)))
+        ],
+        batch_size=500
+    )
+    return Author.objects.order_by('id')
+
+
+def build_scenarios(author):
+    """
+    Return {name: callable making one request}, all as `author`.
+    """
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(author).access_token}')
+    post_ids = list(Post.objects.order_by('id').values_list('id', flat=True)[:100])
+    tag_ids = list(Tag.objects.order_by('id').values_list('id', flat=True)[:3])
+    counter = iter(range(10 ** 9))
+
+    return {
+        'post_list': lambda: client.get('/api/posts/'),
+        'post_retrieve': lambda: client.get(f'/api/posts/{post_ids[next(counter) % len(post_ids)]}/'),
+        'post_create': lambda: client.post(
+            '/api/posts/',
+            {'title': 'Benchmark', 'content': 'Benchmark content', 'tag_ids': tag_ids},
+            format='json'
+        ),
+        'tag_list': lambda: client.get('/api/tags/'),
+        'token': lambda: APIClient().post(
+            '/api/token/', {'username': author.username, 'password': PASSWORD}, format='json'
+        ),
+    }
+
+
+def run_scenario(call, iterations, warmup, warm_cache, profile_path=None):
+    """
+    Time `iterations` calls and return the scenario's measurements.
+    """
+    for _ in range(warmup):
+        call()
+
+    latencies, queries = [], []
+    profiler = cProfile.Profile() if profile_path else None
+    started = time.perf_counter()
+    for _ in range(iterations):
+        if not warm_cache:
+            cache.clear()
+        with QueryRecorder() as recorder:
+            if profiler:
+                profiler.enable()
+            start = time.perf_counter()
+            response = call()
+            latencies.append(time.perf_counter() - start)
+            if profiler:
+                profiler.disable()
+        if response.status_code >= 400:
+            raise RuntimeError(f'{response.status_code}: {response.content[:200]!r}')
+        queries.append(recorder.count)
+    elapsed = time.perf_counter() - started
+
+    if profiler:
+        profiler.dump_stats(profile_path)
+
+    latencies.sort()
+    return {
+        'calls_per_sec': round(iterations / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 3),
+        'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'queries': max(queries),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return a list of human-readable regressions against the baseline.
+    A query count below the baseline is reported too, so the improvement
+    gets recorded with --save-baseline instead of leaving room to regress.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] != expected['queries']:
+            note = '' if result['queries'] > expected['queries'] else '; re-record the baseline'
+            regressions.append(
+                f"{name}: {result['queries']} queries per call (baseline {expected['queries']}{note})"
+            )
+        limit = expected['p50_ms'] * (1 + tolerance)
+        if result['p50_ms'] > limit:
+            regressions.append(
+                f"{name}: p50 {result['p50_ms']:.2f}ms (baseline {expected['p50_ms']:.2f}ms, "
+                f"limit {limit:.2f}ms)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--authors', type=int, default=50)
+    parser.add_argument('--tags', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--tags-per-post', type=int, default=3)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--scenarios', nargs='+', help='run only these scenarios')
+    parser.add_argument('--warm-cache', action='store_true',
+                        help='keep the response cache between calls')
+    parser.add_argument('--profile', type=Path, metavar='DIR',
+                        help='write a cProfile .prof file per scenario')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true',
+                        help='exit with status 1 if any scenario regressed')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='allowed latency increase over the baseline (fraction)')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(
+            REST_FRAMEWORK=BENCHMARK_REST_FRAMEWORK,
+            THROTTLE_PURGE_PROBABILITY=0,  # keeps query counts deterministic
+            DEBUG=False
+        ):
+            author = seed(args.authors, args.tags, args.posts, args.tags_per_post).first()
+            scenarios = build_scenarios(author)
+            if args.profile:
+                args.profile.mkdir(parents=True, exist_ok=True)
+
+            results = {}
+            for name, call in scenarios.items():
+                if args.scenarios and name not in args.scenarios:
+                    continue
+                results[name] = run_scenario(
+                    call, args.iterations, args.warmup, args.warm_cache,
+                    args.profile / f'{name}.prof' if args.profile else None
+                )
+                result = results[name]
+                print(
+                    f"{name:<14} calls/s={result['calls_per_sec']:>8.1f} "
+                    f"p50={result['p50_ms']:>8.2f}ms p95={result['p95_ms']:>8.2f}ms "
+                    f"queries={result['queries']}"
+                )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    scale = {key: getattr(args, key) for key in ('authors', 'tags', 'posts', 'tags_per_post')}
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({'scale': scale, 'results': results}, indent=2) + '\n')
+        print(f'Baseline written to {args.baseline}')
+        return
+
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text())
+        if stored['scale'] != scale:
+            print(f"Baseline was recorded at a different scale {stored['scale']}; not comparing")
+            return
+        regressions = compare(results, stored['results'], args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if not regressions:
+            print('No regressions against baseline')
+        if regressions and args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Compare stock SQLite connection handling against the tuned configuration.
+
+Runs a mixed workload on a throwaway database file with reader and writer
+threads and reports, per configuration:
+- reads/s and writes/s
+- read and write latency percentiles
+- "database is locked" errors
+
+Configurations:
+- stock: a new connection per operation (CONN_MAX_AGE = 0), rollback journal
+  and SQLite's default PRAGMAs
+- tuned: one persistent connection per thread with the PRAGMAS from
+  settings.DATABASES['default']
+
+    python benchmarks/sqlite_tuning.py --readers 8 --writers 2 --duration 10
+
+Only the standard library is used; the schema is a trimmed copy of
+blog_post/blog_author so the queries resemble the list endpoint's.
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from myproject.settings import DATABASES  # noqa: E402
+
+
+SCHEMA = """
+CREATE TABLE blog_author (id INTEGER PRIMARY KEY, username TEXT NOT NULL);
+CREATE TABLE blog_post (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    author_id INTEGER NOT NULL REFERENCES blog_author (id),
+    timestamp REAL NOT NULL
+);
+CREATE INDEX blog_post_timestamp_idx ON blog_post (timestamp);
+"""
+
+READ_SQL = """
+SELECT p.id, p.title, p.content, a.username
+FROM blog_post p JOIN blog_author a ON a.id = p.author_id
+ORDER BY p.timestamp DESC LIMIT 20
+"""
+
+WRITE_SQL = 'INSERT INTO blog_post (title, content, author_id, timestamp) VALUES (?, ?, ?, ?)'
+
+STOCK_PRAGMAS = {'journal_mode': 'DELETE'}
+
+
+def seed(path, authors, posts):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        'INSERT INTO blog_author (id, username) VALUES (?, ?)',
+        [(i, f'author{i}') for i in range(1, authors + 1)]
+    )
+    conn.executemany(
+        WRITE_SQL,
+        [(f'Post {i}', 'Benchmark content. ' * 20, i % authors + 1, i) for i in range(posts)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def connect(path, pragmas):
+    # Django's sqlite3 backend always passes a 5 second timeout unless
+    # OPTIONS overrides it; busy_timeout in pragmas replaces it
+    conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+    for name, value in pragmas.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def worker(path, pragmas, persistent, operation, deadline, latencies, errors):
+    """
+    Repeat `operation` until the deadline, reconnecting each time unless
+    `persistent`.
+    """
+    conn = connect(path, pragmas) if persistent else None
+    counter = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            db = conn or connect(path, pragmas)
+            if operation == 'read':
+                db.execute(READ_SQL).fetchall()
+            else:
+                counter += 1
+                with db:
+                    db.execute(WRITE_SQL, ('Benchmark', 'Benchmark content.', 1, time.time()))
+            if conn is None:
+                db.close()
+        except sqlite3.OperationalError:
+            errors.append(operation)
+            continue
+        latencies.append(time.perf_counter() - start)
+    if conn is not None:
+        conn.close()
+
+
+def run(label, pragmas, persistent, args):
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / 'bench.sqlite3')
+        seed(path, args.authors, args.posts)
+        # journal_mode is persistent, so set it once on the file up front
+        connect(path, pragmas).close()
+
+        reads, writes, errors = [], [], []
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(path, pragmas, persistent, 'read', deadline, reads, errors)
+            )
+            for _ in range(args.readers)
+        ] + [
+            threading.Thread(
+                target=worker,
+                args=(path, pragmas, persistent, 'write', deadline, writes, errors)
+            )
+            for _ in range(args.writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    print(
+        f'{label:<6} reads/s={len(reads) / args.duration:>9.1f} '
+        f'writes/s={len(writes) / args.duration:>8.1f} '
+        f'read p50={percentile(reads, 0.50) * 1000:>7.2f}ms '
+        f'p99={percentile(reads, 0.99) * 1000:>7.2f}ms '
+        f'write p50={percentile(writes, 0.50) * 1000:>7.2f}ms '
+        f'p99={percentile(writes, 0.99) * 1000:>7.2f}ms '
+        f'locked={len(errors)}'
+    )
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per run')
+    parser.add_argument('--authors', type=int, default=50)
+    parser.add_argument('--posts', type=int, default=10000)
+    args = parser.parse_args()
+
+    run('stock', STOCK_PRAGMAS, False, args)
+    run('tuned', DATABASES['default']['PRAGMAS'], True, args)
+
+
+if __name__ == '__main__':
+    main()
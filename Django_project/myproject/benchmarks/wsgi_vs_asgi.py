@@ -0,0 +1,147 @@
+"""
+Compare thread-per-request WSGI against the async ASGI read path.
+
+Opens many concurrent keep-alive connections against two running servers
+and reports throughput and latency percentiles for each:
+- WSGI: the DRF viewsets (e.g. GET /api/posts/)
+- ASGI: the async views (e.g. GET /api/async/posts/)
+
+Start the servers in two terminals first, for example:
+
+    gunicorn myproject.wsgi -w 2 --threads 8 -b 127.0.0.1:8000
+    uvicorn myproject.asgi:application --workers 2 --port 8001
+
+then run:
+
+    python benchmarks/wsgi_vs_asgi.py --token <access token> \
+        --connections 50 200 1000 --duration 10
+
+--slow-client adds a delay before each response is read, simulating slow
+mobile clients that keep a connection (and a WSGI thread) busy.
+Both paths are throttled (DEFAULT_THROTTLE_RATES), so raise the 'user'
+rate before benchmarking or throttled requests will show up as errors.
+Only the standard library is used.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def read_response(reader):
+    """
+    Read one HTTP/1.1 response and return its status code.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed')
+    length = 0
+    chunked = False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value.lower():
+            chunked = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(url, token, deadline, slow_client, latencies, errors):
+    """
+    Issue requests over one keep-alive connection until the deadline.
+    """
+    parts = urlsplit(url)
+    request = (
+        f'GET {parts.path or "/"}{"?" + parts.query if parts.query else ""} HTTP/1.1\r\n'
+        f'Host: {parts.netloc}\r\n'
+        f'Authorization: Bearer {token}\r\n'
+        'Connection: keep-alive\r\n\r\n'
+    ).encode()
+    writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(
+                    parts.hostname, parts.port or 80
+                )
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            if slow_client:
+                await asyncio.sleep(slow_client)
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            errors.append('connection')
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def run(url, token, connections, duration, slow_client):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        client(url, token, deadline, slow_client, latencies, errors)
+        for _ in range(connections)
+    ))
+    return latencies, errors
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(label, connections, duration, latencies, errors):
+    print(
+        f'{label:<6} conns={connections:<5} '
+        f'req/s={len(latencies) / duration:>9.1f} '
+        f'p50={percentile(latencies, 0.50) * 1000:>8.1f}ms '
+        f'p99={percentile(latencies, 0.99) * 1000:>8.1f}ms '
+        f'mean={(statistics.fmean(latencies) if latencies else 0) * 1000:>8.1f}ms '
+        f'errors={len(errors)}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--token', required=True, help='JWT access token')
+    parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000/api/posts/')
+    parser.add_argument('--asgi-url', default='http://127.0.0.1:8001/api/async/posts/')
+    parser.add_argument('--connections', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per run')
+    parser.add_argument('--slow-client', type=float, default=0.0,
+                        help='seconds to wait before reading each response')
+    args = parser.parse_args()
+
+    for connections in args.connections:
+        for label, url in (('wsgi', args.wsgi_url), ('asgi', args.asgi_url)):
+            latencies, errors = asyncio.run(
+                run(url, args.token, connections, args.duration, args.slow_client)
+            )
+            report(label, connections, args.duration, latencies, errors)
+
+
+if __name__ == '__main__':
+    main()
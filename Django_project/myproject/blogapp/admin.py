@@ -1,33 +1,173 @@
+"""
+Admin configuration for the blog application.
+
+Changelists are built to stay fast on million-row tables:
+- EstimatedCountPaginator: Counts exactly up to a cap, then estimates
+- CursorChangeList: Keyset "next page" navigation instead of OFFSET
+- FastChangeListMixin: Wires both in, plus prefix search on indexed
+  lower-case expressions
+"""
+
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db.models import Max, Q
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+
 from .models import Author, Post, Tag
 
+
+CURSOR_VAR = 'before'
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs an unbounded COUNT(*).
+
+    Counts at most ADMIN_COUNT_LIMIT rows. Beyond that, an unfiltered
+    list's count is estimated from the highest primary key, a single index
+    lookup; a filtered or searched list reports the cap as a lower bound.
+    """
+
+    @cached_property
+    def count(self):
+        limit = getattr(settings, 'ADMIN_COUNT_LIMIT', 10000)
+        counted = self.object_list[:limit + 1].count()
+        if counted <= limit:
+            return counted
+        model = self.object_list.model
+        if self.object_list.query.where != model._default_manager.all().query.where:
+            self.lower_bound = True
+            return limit
+        self.estimated = True
+        highest = model._base_manager.aggregate(highest=Max('pk'))['highest']
+        return max(counted, highest or 0)
+
+    estimated = False
+    lower_bound = False
+
+
+class CursorChangeList(ChangeList):
+    """
+    ChangeList that pages through the default newest-first ordering with a
+    primary key cursor (?before=<pk>), so deep pages cost the same as the
+    first one. Sorting by a column falls back to numbered pages.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = None
+        if ORDER_VAR not in request.GET:
+            try:
+                self.cursor = int(request.GET[CURSOR_VAR])
+            except (KeyError, ValueError):
+                pass
+        super().__init__(request, *args, **kwargs)
+
+    @property
+    def uses_cursor(self):
+        return ORDER_VAR not in self.params
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.cursor is not None:
+            queryset = queryset.filter(pk__lt=self.cursor)
+        return queryset
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.next_url = self.first_url = None
+        if not self.uses_cursor or self.show_all:
+            return
+        self.result_list = list(self.result_list[:self.list_per_page])
+        if self.multi_page and self.result_list:
+            self.next_url = self.get_query_string(
+                {CURSOR_VAR: self.result_list[-1].pk}, [PAGE_VAR]
+            )
+        if self.cursor is not None:
+            self.first_url = self.get_query_string(remove=[CURSOR_VAR, PAGE_VAR])
+
+
+class FastChangeListMixin:
+    """
+    ModelAdmin defaults for large tables.
+
+    The whole search term is matched as a case-insensitive prefix of any
+    prefix_search_fields with a range on LOWER(field), which the matching
+    expression indexes serve;
+    search_fields are only needed to enable the search box and
+    autocomplete.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-id',)
+    prefix_search_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        return CursorChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        if not self.prefix_search_fields:
+            return super().get_search_results(request, queryset, search_term)
+        term = search_term.strip().lower()
+        if not term:
+            return queryset, False
+        matches = Q()
+        for field in self.prefix_search_fields:
+            alias = f'_search_{field}'
+            queryset = queryset.alias(**{alias: Lower(field)})
+            matches |= Q(**{f'{alias}__gte': term, f'{alias}__lt': term + '\U0010ffff'})
+        return queryset.filter(matches), False
+
+
 @admin.register(Author)
-class AuthorAdmin(admin.ModelAdmin):
+class AuthorAdmin(FastChangeListMixin, admin.ModelAdmin):
     """
     Admin interface configuration for the Author model.
     Provides list display, search, and filtering capabilities for user management.
     """
-    list_display = ('username', 'email', 'is_superuser', 'is_staff')
+    list_display = ('username', 'email', 'post_count', 'is_superuser', 'is_staff')
     search_fields = ('username', 'email')
+    prefix_search_fields = ('username', 'email')
     list_filter = ('is_superuser', 'is_staff')
+    raw_id_fields = ('following',)
+    readonly_fields = ('post_count', 'tag_count')
 
 @admin.register(Tag)
-class TagAdmin(admin.ModelAdmin):
+class TagAdmin(FastChangeListMixin, admin.ModelAdmin):
     """
     Admin interface configuration for the Tag model.
     Provides list display, search, and filtering capabilities for tag management.
     """
     list_display = ('name', 'created_by')
+    list_select_related = ('created_by',)
     search_fields = ('name',)
-    list_filter = ('created_by',)
+    prefix_search_fields = ('name',)
+    autocomplete_fields = ('created_by',)
+    raw_id_fields = ('followers',)
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(FastChangeListMixin, admin.ModelAdmin):
     """
     Admin interface configuration for the Post model.
     Provides list display, search, and filtering capabilities for blog post management.
     """
-    list_display = ('title', 'author', 'timestamp')
-    search_fields = ('title', 'content')
-    list_filter = ('author', 'timestamp')
+    list_display = ('title', 'author', 'tag_names', 'timestamp')
+    list_select_related = ('author',)
+    search_fields = ('title',)
+    prefix_search_fields = ('title',)
+    list_filter = ('timestamp',)
+    autocomplete_fields = ('author', 'tags')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('tags')
 
+    @admin.display(description='Tags')
+    def tag_names(self, obj):
+        return ', '.join(tag.name for tag in obj.tags.all())
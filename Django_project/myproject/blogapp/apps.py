@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class BlogappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blogapp'
+
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
+        # Register background tasks so workers can run them
+        from . import feeds, retention  # noqa: F401
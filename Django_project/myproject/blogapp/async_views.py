@@ -0,0 +1,162 @@
+"""
+Asynchronous read-only views for the blog application.
+
+DRF 3.14 viewsets are synchronous, so these plain Django async views serve
+the read-heavy post and tag endpoints under ASGI without holding a thread
+per request. They reuse the serializers, JWT authentication, ETag
+validators and list cache of the synchronous API:
+- post_list: GET /api/async/posts/
+- post_detail: GET /api/async/posts/{id}/
+- tag_list: GET /api/async/tags/
+- tag_detail: GET /api/async/tags/{id}/
+"""
+
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.http import JsonResponse
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+from .authentication import BlogJWTAuthentication
+from .mixins import list_etag, list_stats, make_etag, not_modified_response, set_validators
+from .models import Post, Tag
+from .serializers import PostListValuesSerializer, PostSerializer, TagDetailValuesSerializer, TagSerializer
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    """
+    Render data the way DRF's JSONRenderer does (compact, UTF-8).
+    """
+    return JsonResponse(
+        data,
+        encoder=encoders.JSONEncoder,
+        status=status_code,
+        safe=False,
+        json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False}
+    )
+
+
+def async_api_view(view):
+    """
+    Restrict an async view to GET/HEAD, require JWT authentication and
+    apply the same throttles as the DRF views.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return json_response(
+                {'detail': f'Method "{request.method}" not allowed.'},
+                status_code=status.HTTP_405_METHOD_NOT_ALLOWED
+            )
+        try:
+            result = await BlogJWTAuthentication().aauthenticate(request)
+        except exceptions.APIException as exc:
+            data = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+            return json_response(data, status_code=exc.status_code)
+        if result is None:
+            return json_response(
+                {'detail': 'Authentication credentials were not provided.'},
+                status_code=status.HTTP_401_UNAUTHORIZED
+            )
+        request.user = result[0]
+
+        for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+            throttle = throttle_class()
+            if not await sync_to_async(throttle.allow_request)(request, None):
+                throttled = exceptions.Throttled(throttle.wait())
+                return json_response(
+                    {'detail': throttled.detail},
+                    status_code=throttled.status_code
+                )
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def cached_list(request, queryset, cache_prefix, build):
+    """
+    Conditional, ETag-versioned cached list shared with the sync viewsets.
+    `build` is a coroutine function returning the serialized data.
+    """
+    stats = await queryset.order_by().aaggregate(**list_stats)
+    etag, last_modified = list_etag(stats), stats['last_modified']
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = f'{cache_prefix}:{etag}'
+    data = await cache.aget(cache_key)
+    if data is None:
+        data = await build()
+        await cache.aset(cache_key, data, settings.CACHE_TTL)
+    return set_validators(json_response(data), etag, last_modified)
+
+
+async def conditional_detail(request, queryset, pk, build):
+    """
+    Conditional detail response; `build` receives the object's queryset.
+    """
+    last_modified = await queryset.filter(pk=pk).values_list('updated_at', flat=True).afirst()
+    if last_modified is None:
+        return json_response({'detail': 'Not found.'}, status_code=status.HTTP_404_NOT_FOUND)
+
+    etag = make_etag(pk, last_modified)
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    return set_validators(json_response(await build(queryset.filter(pk=pk))), etag, last_modified)
+
+
+@async_api_view
+async def post_list(request):
+    """
+    List all posts (same payload as GET /api/posts/).
+    """
+    async def build():
+        return await PostListValuesSerializer(Post.objects.all()).adata()
+
+    return await cached_list(request, Post.objects.all(), 'post_list', build)
+
+
+@async_api_view
+async def post_detail(request, pk):
+    """
+    Get post details (same payload as GET /api/posts/{id}/).
+    """
+    async def build(queryset):
+        post = await queryset.select_related('author').aget()
+        await sync_to_async(prefetch_related_objects)([post], 'tags')
+        return PostSerializer(post).data
+
+    return await conditional_detail(request, Post.objects.all(), pk, build)
+
+
+@async_api_view
+async def tag_list(request):
+    """
+    List all tags (same payload as GET /api/tags/).
+    """
+    async def build():
+        return await TagDetailValuesSerializer(Tag.objects.all()).adata()
+
+    return await cached_list(request, Tag.objects.all(), 'tag_list', build)
+
+
+@async_api_view
+async def tag_detail(request, pk):
+    """
+    Get tag details (same payload and visibility as GET /api/tags/{id}/).
+    """
+    queryset = Tag.objects.all()
+    if not request.user.is_superuser:
+        queryset = queryset.filter(created_by_id=request.user.id)
+
+    async def build(queryset):
+        tag = await queryset.select_related('created_by').aget()
+        return TagSerializer(tag).data
+
+    return await conditional_detail(request, queryset, pk, build)
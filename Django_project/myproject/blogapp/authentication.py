@@ -0,0 +1,145 @@
+"""
+Authentication classes for the blog application.
+
+This module provides a cheaper JWT authentication path:
+- UserCache: Short-lived in-process cache of authenticated authors
+- BlogJWTAuthentication: JWT authentication with cached or stateless users
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """
+    Thread-safe, size-bounded cache of Author instances keyed by user_id.
+
+    Entries expire after JWT_USER_CACHE_TTL seconds and are invalidated
+    explicitly when an Author is saved or deleted (see signals.py).
+    Callers receive a copy so per-request mutations never leak.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'JWT_USER_CACHE_TTL', 30)
+
+    def get(self, user_id):
+        """
+        Return a cached user, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        """
+        Store a user until the configured TTL elapses.
+        """
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, copy.copy(user))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """
+        Drop a single user from the cache.
+        """
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class BlogJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that avoids loading the Author row on every request.
+
+    - Safe (read-only) requests get a stateless TokenUser built from the
+      token claims when JWT_STATELESS_USER is enabled. No database hit.
+    - All other requests load the Author through the in-process user
+      cache, falling back to the database on a miss.
+
+    Stateless users only know what the token carries (id, username,
+    is_staff, is_superuser), so tokens must be issued through
+    CustomTokenObtainPairSerializer to include those claims.
+    """
+
+    def authenticate(self, request):
+        self.stateless = (
+            getattr(settings, 'JWT_STATELESS_USER', False)
+            and request.method in permissions.SAFE_METHODS
+        )
+        return super().authenticate(request)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of authenticate() for plain Django async views.
+        Only a user cache miss leaves the event loop.
+        """
+        self.stateless = (
+            getattr(settings, 'JWT_STATELESS_USER', False)
+            and request.method in permissions.SAFE_METHODS
+        )
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_cached_user(validated_token)
+        if user is None:
+            user = await sync_to_async(self.get_user)(validated_token)
+        return user, validated_token
+
+    def get_cached_user(self, validated_token):
+        """
+        Return a stateless or cached user for the validated token, or None
+        if the user has to be loaded from the database.
+        """
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        if getattr(self, 'stateless', False):
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+        return user_cache.get(validated_token[api_settings.USER_ID_CLAIM])
+
+    def get_user(self, validated_token):
+        """
+        Return a stateless or cached user for the validated token.
+        """
+        user = self.get_cached_user(validated_token)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(validated_token[api_settings.USER_ID_CLAIM], user)
+        return user
@@ -0,0 +1,130 @@
+"""
+Authentication backends for the blog application.
+
+This module keeps password hashing off the request workers:
+- HashingPool: Bounded thread pool that runs password hash checks
+- LoginBackpressure: Raised when the hashing pool is saturated
+- OffloadedModelBackend: ModelBackend that checks passwords in the pool
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+
+
+class LoginBackpressure(Exception):
+    """
+    Raised by authenticate() when too many logins are being hashed at once.
+
+    A plain exception rather than a DRF APIException, because authenticate()
+    also runs outside DRF (the admin login form). The token view answers it
+    with a JSON 503 and LoginBackpressureMiddleware with a plain 503.
+    """
+
+    def __init__(self, message='Too many login attempts in progress, please retry shortly.'):
+        super().__init__(message)
+
+
+class HashingPool:
+    """
+    Runs CPU-heavy password hashing on a small dedicated thread pool.
+
+    At most `workers` hashes run at once and at most `backlog` more may
+    wait; anything beyond that fails fast with LoginBackpressure instead
+    of tying up another request worker.
+    """
+
+    def __init__(self, workers, backlog, timeout):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix='login-hash'
+        )
+        self._slots = threading.BoundedSemaphore(workers + backlog)
+
+    def run(self, func, *args):
+        """
+        Run func(*args) in the pool and wait for its result.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise LoginBackpressure()
+        try:
+            future = self._executor.submit(self._job, func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            # A job that never started will not release its slot itself
+            if future.cancel():
+                self._slots.release()
+            raise LoginBackpressure()
+
+    def _job(self, func, *args):
+        """
+        Run func(*args) and free its slot when it finishes, so a hash the
+        caller stopped waiting for still counts against workers + backlog.
+        """
+        try:
+            return func(*args)
+        finally:
+            self._slots.release()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """
+    Return the process-wide hashing pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    workers=getattr(settings, 'LOGIN_HASH_WORKERS', 4),
+                    backlog=getattr(settings, 'LOGIN_HASH_BACKLOG', 16),
+                    timeout=getattr(settings, 'LOGIN_HASH_TIMEOUT', 10),
+                )
+    return _pool
+
+
+class OffloadedModelBackend(ModelBackend):
+    """
+    ModelBackend that looks the user up on the request thread but verifies
+    the password hash in the HashingPool.
+
+    Hash upgrades (e.g. after raising the PBKDF2 iteration count) are still
+    applied on successful login, just like ModelBackend.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        pool = get_hashing_pool()
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so response time does not reveal unknown usernames
+            pool.run(make_password, password)
+            return None
+
+        if not pool.run(check_password, password, user.password):
+            return None
+        if identify_hasher(user.password).must_update(user.password):
+            user.set_password(password)
+            user.save(update_fields=['password'])
+        if self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,128 @@
+"""
+Fan-out-on-write timelines for the blog application.
+
+This module maintains the TimelineEntry table behind the feed endpoint:
+- schedule: Queues a timeline job as a background task
+- fanout_post: Adds a post to the timelines of everyone who should see it
+- backfill_timeline: Adds recent posts after a new follow
+- prune_timeline: Removes posts a user no longer follows after an unfollow
+- get_feed: Reads one page of a user's timeline
+"""
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Author, Post, Tag, TimelineEntry
+from .tasks import enqueue, task
+
+
+def schedule(func, *args):
+    """
+    Queue a timeline job for the task workers (manage.py runtasks) when
+    FEED_FANOUT_ASYNC is enabled, otherwise run it inline once the current
+    transaction commits.
+    """
+    if getattr(settings, 'FEED_FANOUT_ASYNC', True):
+        enqueue(func, *args)
+    else:
+        transaction.on_commit(lambda: func(*args))
+
+
+def _write_entries(post_ids, user_ids):
+    batch_size = getattr(settings, 'FEED_FANOUT_BATCH_SIZE', 500)
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=user_id, post_id=post_id)
+            for user_id in user_ids
+            for post_id in post_ids
+        ],
+        batch_size=batch_size,
+        ignore_conflicts=True
+    )
+
+
+@task(priority=10)
+def fanout_post(post_id):
+    """
+    Add a post to the timelines of its author, the author's followers and
+    the followers of its tags. Safe to run repeatedly for the same post.
+    """
+    author_id = Post.objects.filter(id=post_id).values_list('author_id', flat=True).first()
+    if author_id is None:
+        return
+
+    recipients = {author_id}
+    recipients.update(
+        Author.following.through.objects
+        .filter(to_author_id=author_id)
+        .values_list('from_author_id', flat=True)
+    )
+    recipients.update(
+        Author.objects
+        .filter(followed_tags__posts=post_id)
+        .values_list('id', flat=True)
+    )
+    _write_entries([post_id], recipients)
+
+
+@task(priority=10)
+def backfill_timeline(user_id, author_id=None, tag_id=None):
+    """
+    Add the most recent posts by a newly followed author (or with a newly
+    followed tag) to a user's timeline.
+    """
+    posts = Post.objects.all()
+    if author_id is not None:
+        posts = posts.filter(author_id=author_id)
+    if tag_id is not None:
+        posts = posts.filter(tags=tag_id)
+    size = getattr(settings, 'FEED_BACKFILL_SIZE', 50)
+    post_ids = list(posts.order_by('-id').values_list('id', flat=True)[:size])
+    _write_entries(post_ids, [user_id])
+
+
+@task
+def prune_timeline(user_id):
+    """
+    Remove timeline entries the user no longer follows: posts that are
+    not their own and neither by a followed author nor carrying a
+    followed tag.
+    """
+    following = Author.following.through.objects.filter(
+        from_author_id=user_id
+    ).values('to_author_id')
+    followed_tags = Tag.followers.through.objects.filter(
+        author_id=user_id
+    ).values('tag_id')
+
+    stale = (
+        TimelineEntry.objects
+        .filter(user_id=user_id)
+        .exclude(post__author_id=user_id)
+        .exclude(post__author_id__in=following)
+        .exclude(post__tags__in=followed_tags)
+    )
+    TimelineEntry.objects.filter(id__in=stale.values('id')).delete()
+
+
+def get_feed(user_id, before=None, limit=20):
+    """
+    Return (posts, next) for up to `limit` posts from a user's timeline,
+    newest first, starting below the `before` post id. `next` is the
+    `before` for the following page, or None on the last page.
+
+    Soft-deleted posts keep their timeline rows until they are purged, so
+    they are skipped in the entry query itself; filtering only the posts
+    would return short (even empty) pages.
+    """
+    entries = TimelineEntry.objects.filter(user_id=user_id, post__deleted_at__isnull=True)
+    if before is not None:
+        entries = entries.filter(post_id__lt=before)
+    page = list(entries.order_by('-post_id').values_list('post_id', flat=True)[:limit])
+    posts = list(
+        Post.objects.filter(id__in=page)
+        .select_related('author')
+        .prefetch_related('tags')
+        .order_by('-id')
+    )
+    return posts, (page[-1] if len(page) == limit else None)
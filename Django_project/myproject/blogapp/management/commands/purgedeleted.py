@@ -0,0 +1,38 @@
+"""
+Purge soft-deleted posts and optionally archive old ones (see blogapp/retention.py).
+
+Usage:
+    python manage.py purgedeleted [--retention-days N] [--archive-after-days N]
+        [--chunk-size N]
+
+Intended to run periodically, e.g. from cron.
+"""
+
+from django.core.management.base import BaseCommand
+
+from blogapp import retention
+
+
+class Command(BaseCommand):
+    help = 'Purge soft-deleted posts and archive old posts in small chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days', type=int, default=None,
+            help='Keep soft-deleted posts this long (default SOFT_DELETE_RETENTION_DAYS)'
+        )
+        parser.add_argument(
+            '--archive-after-days', type=int, default=None,
+            help='Also archive live posts older than this many days'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=None,
+            help='Rows per transaction (default PURGE_CHUNK_SIZE)'
+        )
+
+    def handle(self, *args, retention_days, archive_after_days, chunk_size, **options):
+        purged = retention.purge_deleted(retention_days, chunk_size)
+        self.stdout.write(f'Purged {purged} deleted posts')
+        if archive_after_days is not None:
+            archived = retention.archive_posts(archive_after_days, chunk_size)
+            self.stdout.write(f'Archived {archived} posts')
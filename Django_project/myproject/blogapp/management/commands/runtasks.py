@@ -0,0 +1,90 @@
+"""
+Worker for the database-backed task queue (see blogapp/tasks.py).
+
+Usage:
+    python manage.py runtasks [--concurrency N] [--poll-interval SECONDS] [--once]
+"""
+
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blogapp import tasks
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            default=getattr(settings, 'TASK_WORKER_CONCURRENCY', 2),
+            help='Tasks run at the same time (1 runs them on the main thread)'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'TASK_POLL_INTERVAL', 1.0),
+            help='Seconds to wait before polling an empty queue again'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once no runnable tasks are left'
+        )
+
+    def handle(self, *args, concurrency, poll_interval, once, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        concurrency = max(1, concurrency)
+        executor = ThreadPoolExecutor(concurrency, thread_name_prefix='task-worker') \
+            if concurrency > 1 else None
+        in_flight = set()
+        processed = failed = 0
+        next_recovery = 0
+
+        self.stdout.write(f'Worker {worker_id} started with concurrency {concurrency}')
+        try:
+            while not self.stopping:
+                if time.monotonic() >= next_recovery:
+                    tasks.requeue_stale()
+                    next_recovery = time.monotonic() + 60
+
+                claimed = tasks.claim_tasks(worker_id, concurrency - len(in_flight)) \
+                    if len(in_flight) < concurrency else []
+                for task in claimed:
+                    if executor is None:
+                        ok = tasks.run_task(task)
+                        processed, failed = processed + 1, failed + (not ok)
+                    else:
+                        in_flight.add(executor.submit(tasks.run_in_worker, task))
+
+                if in_flight:
+                    done, in_flight = wait(
+                        in_flight,
+                        timeout=0 if claimed else poll_interval,
+                        return_when=FIRST_COMPLETED
+                    )
+                    for future in done:
+                        processed, failed = processed + 1, failed + (not future.result())
+                elif not claimed:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+        finally:
+            if executor is not None:
+                # Let running tasks finish so their rows are not left locked
+                for future in wait(in_flight).done:
+                    processed, failed = processed + 1, failed + (not future.result())
+                executor.shutdown()
+
+        self.stdout.write(f'Worker {worker_id} stopped: {processed} tasks run, {failed} failed')
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,143 @@
+"""
+Middleware for the blog application.
+
+This module contains request-level instrumentation:
+- QueryRecorder: Context manager that counts and times SQL queries
+- QueryCountMiddleware: Records SQL count and time for every request
+- LoginBackpressureMiddleware: Answers saturated password hashing with a 503
+"""
+
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from .backends import LoginBackpressure
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """
+    Context manager that records every SQL query executed on any
+    configured database connection while it is active.
+
+    Attributes:
+    - count: Number of queries executed
+    - duration: Total time spent in the database (seconds)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Execute wrapper installed on each connection.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stack.close()
+        self._stack = None
+        return False
+
+
+def get_query_budget(view):
+    """
+    Return the query budget declared on a viewset for its current action,
+    or None if the view does not declare one.
+    """
+    budgets = getattr(view, 'query_budgets', None) or {}
+    return budgets.get(getattr(view, 'action', None))
+
+
+class QueryCountMiddleware:
+    """
+    Records the number of SQL queries and the time spent in the database
+    for every request.
+
+    When QUERY_COUNT_HEADERS is enabled (defaults to DEBUG) the results are
+    reported through the X-Query-Count, X-Query-Time and X-Query-Budget
+    response headers. Requests that exceed the budget declared on their
+    viewset are always logged as warnings.
+
+    Under ASGI the recorder is installed on the request's sync thread, which
+    is where the async ORM runs its queries.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        await sync_to_async(recorder.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recorder.__exit__)(None, None, None)
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        """
+        Log budget overruns and attach the X-Query-* headers.
+        """
+        renderer_context = getattr(response, 'renderer_context', None) or {}
+        budget = get_query_budget(renderer_context.get('view'))
+
+        if budget is not None and recorder.count > budget:
+            logger.warning(
+                'Query budget exceeded for %s %s: %d queries (budget %d)',
+                request.method, request.path, recorder.count, budget
+            )
+
+        if getattr(settings, 'QUERY_COUNT_HEADERS', settings.DEBUG):
+            response['X-Query-Count'] = str(recorder.count)
+            response['X-Query-Time'] = f'{recorder.duration * 1000:.2f}ms'
+            if budget is not None:
+                response['X-Query-Budget'] = str(budget)
+
+        return response
+
+
+class LoginBackpressureMiddleware(MiddlewareMixin):
+    """
+    Turns LoginBackpressure raised outside the API, e.g. by the admin login
+    form, into a 503 with Retry-After instead of a server error.
+    """
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, LoginBackpressure):
+            return None
+        response = HttpResponse(str(exception), status=503, content_type='text/plain')
+        response['Retry-After'] = '1'
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogapp', '0003_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleCounter',
+            fields=[
+                ('key', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('window_index', models.BigIntegerField()),
+                ('current', models.IntegerField(default=0)),
+                ('previous', models.IntegerField(default=0)),
+                ('expires_at', models.BigIntegerField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Throttle counter',
+                'verbose_name_plural': 'Throttle counters',
+                'db_table': 'blog_throttle',
+            },
+        ),
+        migrations.CreateModel(
+            name='ThrottleRejection',
+            fields=[
+                ('scope', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Throttle rejection',
+                'verbose_name_plural': 'Throttle rejections',
+                'db_table': 'blog_throttle_rejection',
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Author = apps.get_model('blogapp', 'Author')
+    Post = apps.get_model('blogapp', 'Post')
+    Tag = apps.get_model('blogapp', 'Tag')
+
+    def count_of(model, field):
+        return Coalesce(Subquery(
+            model.objects.filter(**{field: OuterRef('pk')})
+            .order_by().values(field).annotate(n=Count('pk')).values('n')
+        ), 0)
+
+    Author.objects.update(
+        post_count=count_of(Post, 'author'),
+        tag_count=count_of(Tag, 'created_by'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogapp', '0004_throttle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='tag_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['-post_count', '-id'], name='blog_author_post_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['-tag_count', '-id'], name='blog_author_tag_count_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:07
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def backfill_popularity(apps, schema_editor):
+    Post = apps.get_model('blogapp', 'Post')
+    TagPopularity = apps.get_model('blogapp', 'TagPopularity')
+    counts = (
+        Post.tags.through.objects.order_by()
+        .values_list('tag_id').annotate(n=Count('pk'))
+    )
+    TagPopularity.objects.bulk_create(
+        [TagPopularity(tag_id=tag_id, post_count=n) for tag_id, n in counts.iterator()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogapp', '0005_author_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagPopularity',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popularity', serialize=False, to='blogapp.tag')),
+                ('post_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Tag popularity',
+                'verbose_name_plural': 'Tag popularity',
+                'db_table': 'blog_tag_popularity',
+                'indexes': [models.Index(fields=['-post_count', 'tag'], name='blog_tag_popularity_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_popularity, migrations.RunPython.noop),
+    ]
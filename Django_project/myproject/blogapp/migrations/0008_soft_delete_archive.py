@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogapp', '0007_task_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('content', models.TextField()),
+                ('timestamp', models.DateTimeField()),
+                ('tag_names', models.JSONField(default=list)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archived post',
+                'verbose_name_plural': 'Archived posts',
+                'db_table': 'blog_post_archive',
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='author',
+            name='blog_author_post_count_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='author',
+            name='blog_author_tag_count_idx',
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['-post_count', '-id'], name='blog_author_post_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['-tag_count', '-id'], name='blog_author_tag_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['author', '-id'], name='blog_post_author_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['timestamp'], name='blog_post_timestamp_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='blog_post_deleted_idx'),
+        ),
+        migrations.AddField(
+            model_name='postarchive',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_posts', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:19
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogapp', '0008_soft_delete_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='blog_author_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='blog_author_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(django.db.models.functions.text.Lower('title'), condition=models.Q(('deleted_at__isnull', True)), name='blog_post_title_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='blog_tag_name_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,160 @@
+"""
+View mixins for the blog application.
+
+This module contains reusable viewset behaviour:
+- make_etag, list_stats, not_modified_response, set_validators:
+  Conditional GET helpers shared by sync and async views
+- ConditionalGetMixin: Weak ETag / Last-Modified validators and 304 responses
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """
+    Build a weak ETag from the given validator parts.
+    """
+    digest = hashlib.md5(
+        ':'.join(str(part) for part in parts).encode(),
+        usedforsecurity=False
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+# Aggregate used to build list validators. The row count is part of the
+# ETag so deletions change it too.
+list_stats = {
+    'last_modified': Max('updated_at'),
+    'count': Count('id'),
+}
+
+
+def list_etag(stats):
+    """
+    Return the ETag for a list given its list_stats aggregate.
+    """
+    return make_etag('list', stats['count'], stats['last_modified'])
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    Return a 304 response if the client's cached copy is current.
+    """
+    if etag is None:
+        return None
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None
+    )
+    if response is not None:
+        response['ETag'] = etag
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Attach ETag and Last-Modified headers to a successful response.
+    """
+    if etag is not None and response.status_code == status.HTTP_200_OK:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(int(last_modified.timestamp()))
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Adds conditional GET support to list and retrieve actions.
+
+    Validators are computed from the `updated_at` column before anything is
+    serialized:
+    - retrieve: the object's updated_at (one indexed lookup)
+    - list: max(updated_at) and row count over the listed queryset
+
+    Requests whose If-None-Match / If-Modified-Since still match get a 304
+    with no body. Other responses carry ETag and Last-Modified headers.
+
+    When `list_cache_key` is set, serialized list data is cached under a key
+    versioned by the list ETag, so edits and deletes never serve stale data.
+
+    When `values_serializer_class` is set (and FAST_LIST_SERIALIZERS is on),
+    unpaginated lists are built with it instead of the DRF serializer.
+    """
+    list_cache_key = None
+    values_serializer_class = None
+
+    def get_list_validators(self, queryset):
+        """
+        Return (etag, last_modified) for a list response.
+        """
+        stats = queryset.order_by().aggregate(**list_stats)
+        return list_etag(stats), stats['last_modified']
+
+    def get_object_validators(self):
+        """
+        Return (etag, last_modified) for the requested object, or
+        (None, None) if it does not exist in the viewset's queryset.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        last_modified = (
+            self.filter_queryset(self.get_queryset())
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list('updated_at', flat=True)
+            .first()
+        )
+        if last_modified is None:
+            return None, None
+        return make_etag(self.kwargs[lookup_url_kwarg], last_modified), last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_object_validators()
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = super().retrieve(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_list_validators(
+            self.filter_queryset(self.get_queryset())
+        )
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        if self.list_cache_key is None:
+            response = self.serialize_list(request, *args, **kwargs)
+            return set_validators(response, etag, last_modified)
+
+        cache_key = f'{self.list_cache_key}:{etag}'
+        cached_data = cache.get(cache_key)
+        if cached_data is None:
+            response = self.serialize_list(request, *args, **kwargs)
+            cache.set(cache_key, response.data, settings.CACHE_TTL)
+        else:
+            response = Response(cached_data)
+        return set_validators(response, etag, last_modified)
+
+    def serialize_list(self, request, *args, **kwargs):
+        """
+        Build the list response, through values_serializer_class when it
+        applies and the regular DRF list otherwise.
+        """
+        if (
+            self.values_serializer_class is None
+            or self.paginator is not None
+            or not getattr(settings, 'FAST_LIST_SERIALIZERS', True)
+        ):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self.values_serializer_class(queryset).data)
+
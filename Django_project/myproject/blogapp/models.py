@@ -4,12 +4,19 @@ Models for the blog application.
 This module defines the core data models for the blog application:
 - Author: Custom user model for authentication and author management
 - Tag: Model for categorizing posts
-- Post: Main blog post model
+- Post: Main blog post model (soft-deleted rows are hidden from Post.objects)
+- PostArchive: Cold storage for old posts moved out of the hot table
+- TimelineEntry: Precomputed per-user feed of post ids
+- ThrottleCounter, ThrottleRejection: Shared state for API rate limiting
+- TagPopularity: Incrementally maintained post count per tag
+- Task: Background job in the database-backed task queue
 """
 
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.contrib.auth.hashers import make_password
+from django.db.models.functions import Lower
 
 
 # Create your models here.
@@ -25,18 +32,76 @@ class Author(AbstractUser):
     - email: Author's email address
     - password: Hashed password for authentication
     
+    Additional fields:
+    - following: Authors whose posts appear in this author's feed
+    - post_count: Number of posts written (denormalized, maintained by signals)
+    - tag_count: Number of tags created (denormalized, maintained by signals)
+    - deleted_at: When the account was deleted; its content is purged in the background
+    
     Additional methods:
+    - save: Never writes the counters back when updating an existing row
+    - soft_delete: Deactivate the account and mark it deleted
     - __str__: Returns the username for string representation
     """
+    following = models.ManyToManyField(
+        'self',
+        symmetrical=False,
+        related_name="followers",
+        blank=True
+    )
+    post_count = models.PositiveIntegerField(default=0)
+    tag_count = models.PositiveIntegerField(default=0)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
     
     class Meta:
         db_table = 'blog_author'
         verbose_name = 'Author'
         verbose_name_plural = 'Authors'
+        indexes = [
+            models.Index(
+                fields=['-post_count', '-id'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='blog_author_post_count_idx'
+            ),
+            models.Index(
+                fields=['-tag_count', '-id'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='blog_author_tag_count_idx'
+            ),
+            # Admin prefix search
+            models.Index(Lower('username'), name='blog_author_username_lower_idx'),
+            models.Index(Lower('email'), name='blog_author_email_lower_idx'),
+        ]
+
+    # Only ever changed with F() updates by signals
+    counter_fields = ('post_count', 'tag_count')
 
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        """
+        Leave the counters out of full saves of an existing row (profile
+        updates, the admin change form), so a stale in-memory value cannot
+        overwrite increments committed since the instance was loaded.
+        """
+        if (not self._state.adding and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+    def soft_delete(self):
+        """
+        Deactivate the account and mark it deleted. Its posts, tags and the
+        row itself are removed later by retention.purge_author.
+        """
+        self.deleted_at = timezone.now()
+        self.is_active = False
+        self.save(update_fields=['deleted_at', 'is_active'])
+
 
 class Tag(models.Model):
     """
@@ -45,6 +110,8 @@ class Tag(models.Model):
     Fields:
     - name: Unique name of the tag (CharField, max_length=50)
     - created_by: ForeignKey to Author who created the tag (optional)
+    - followers: Authors whose feed includes posts with this tag
+    - updated_at: When the tag was last modified (DateTimeField, auto_now=True)
     
     Methods:
     - __str__: Returns the tag name for string representation
@@ -57,33 +124,67 @@ class Tag(models.Model):
         null=True, 
         blank=True
     )
+    followers = models.ManyToManyField(
+        Author,
+        blank=True,
+        related_name="followed_tags"
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'blog_tag'
         verbose_name = 'Tag'
         verbose_name_plural = 'Tags'
+        indexes = [
+            # Admin prefix search
+            models.Index(Lower('name'), name='blog_tag_name_lower_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+    def live(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def deleted(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+class LivePostManager(models.Manager.from_queryset(PostQuerySet)):
+    """
+    Default Post manager; soft-deleted posts are excluded so every query
+    can use the partial indexes on live rows.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().live()
+
+
 class Post(models.Model):
     """
     Model representing blog posts.
+    Post.objects only returns live posts; Post.all_objects includes
+    soft-deleted ones awaiting purge.
     
     Fields:
     - title: Title of the post (CharField, max_length=200)
     - content: Main content of the post (TextField)
     - timestamp: When the post was created (DateTimeField, auto_now_add=True)
+    - updated_at: When the post or its tags/author were last modified (DateTimeField, auto_now=True)
     - author: ForeignKey to Author who created the post
     - tags: ManyToMany relationship with Tag
+    - deleted_at: When the post was soft-deleted (null for live posts)
     
     Methods:
+    - soft_delete: Hide the post; the row is purged after SOFT_DELETE_RETENTION_DAYS
     - __str__: Returns the post title for string representation
     """
     title = models.CharField(max_length=200)
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     author = models.ForeignKey(
         Author, 
         on_delete=models.CASCADE, 
@@ -94,21 +195,257 @@ class Post(models.Model):
         blank=True,
         related_name="posts"
     )
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LivePostManager()
+    all_objects = PostQuerySet.as_manager()
 
     class Meta:
         db_table = 'blog_post'
         verbose_name = 'Post'
         verbose_name_plural = 'Posts'
+        indexes = [
+            models.Index(
+                fields=['author', '-id'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='blog_post_author_live_idx'
+            ),
+            models.Index(
+                fields=['timestamp'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='blog_post_timestamp_live_idx'
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='blog_post_deleted_idx'
+            ),
+            # Admin prefix search
+            models.Index(
+                Lower('title'),
+                condition=models.Q(deleted_at__isnull=True),
+                name='blog_post_title_lower_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def soft_delete(self):
+        """
+        Hide the post from every Post.objects query in one UPDATE.
+        Counters are adjusted by signals; retention.purge_deleted removes
+        the row later.
+        """
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at', 'updated_at'])
+
+
+class PostArchive(models.Model):
+    """
+    Model holding posts moved out of blog_post by retention.archive_posts.
+    Archived posts are no longer served by the API or counted on their
+    author and tags.
+    
+    Fields:
+    - id: The original post id
+    - title, content, timestamp: Copied from the post
+    - author: ForeignKey to Author who wrote the post
+    - tag_names: Names of the post's tags when it was archived
+    - archived_at: When the post was archived
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    content = models.TextField()
+    timestamp = models.DateTimeField()
+    author = models.ForeignKey(
+        Author,
+        on_delete=models.CASCADE,
+        related_name="archived_posts"
+    )
+    tag_names = models.JSONField(default=list)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'blog_post_archive'
+        verbose_name = 'Archived post'
+        verbose_name_plural = 'Archived posts'
+
+    def __str__(self):
+        return self.title
+
+
+class TimelineEntry(models.Model):
+    """
+    Model representing one post in one author's precomputed feed.
+    Rows are written by fan-out when a post is created or tagged
+    (see feeds.py), so reading a feed is a single range scan over
+    the (user, post) index.
+    
+    Fields:
+    - user: ForeignKey to the Author who owns the timeline
+    - post: ForeignKey to the Post shown in the timeline
+    """
+    user = models.ForeignKey(
+        Author,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+        db_index=False
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries"
+    )
+
+    class Meta:
+        db_table = 'blog_timeline'
+        verbose_name = 'Timeline entry'
+        verbose_name_plural = 'Timeline entries'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='blog_timeline_user_post'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}:{self.post_id}'
+
+
+class ThrottleCounter(models.Model):
+    """
+    Model holding one sliding-window rate-limit counter per throttle key.
+    Rows have a fixed size and are updated atomically with a single upsert
+    (see throttling.py), so limits hold across all worker processes.
+    
+    Fields:
+    - key: Throttle cache key, e.g. "throttle_user_1" (primary key)
+    - window_index: Index of the current window (timestamp // duration)
+    - current: Requests seen in the current window
+    - previous: Requests seen in the previous window
+    - expires_at: Unix time after which the row carries no information
+    """
+    key = models.CharField(max_length=255, primary_key=True)
+    window_index = models.BigIntegerField()
+    current = models.IntegerField(default=0)
+    previous = models.IntegerField(default=0)
+    expires_at = models.BigIntegerField(db_index=True)
 
+    class Meta:
+        db_table = 'blog_throttle'
+        verbose_name = 'Throttle counter'
+        verbose_name_plural = 'Throttle counters'
 
+    def __str__(self):
+        return self.key
 
 
+class ThrottleRejection(models.Model):
+    """
+    Model counting rejected requests per throttle scope across all workers.
+    
+    Fields:
+    - scope: Throttle scope, e.g. "user" or "anon" (primary key)
+    - count: Number of requests rejected in this scope
+    """
+    scope = models.CharField(max_length=50, primary_key=True)
+    count = models.BigIntegerField(default=0)
 
+    class Meta:
+        db_table = 'blog_throttle_rejection'
+        verbose_name = 'Throttle rejection'
+        verbose_name_plural = 'Throttle rejections'
 
+    def __str__(self):
+        return f'{self.scope}: {self.count}'
 
 
+class TagPopularity(models.Model):
+    """
+    Model holding the number of posts carrying each tag.
+    Maintained incrementally from Post.tags changes (see signals.py), so the
+    tag cloud is read from an index instead of aggregating the through table.
+    
+    Fields:
+    - tag: The counted tag (primary key)
+    - post_count: Number of posts with this tag
+    """
+    tag = models.OneToOneField(
+        Tag,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='popularity'
+    )
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'blog_tag_popularity'
+        verbose_name = 'Tag popularity'
+        verbose_name_plural = 'Tag popularity'
+        indexes = [
+            models.Index(fields=['-post_count', 'tag'], name='blog_tag_popularity_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag_id}: {self.post_count}'
+
+
+class Task(models.Model):
+    """
+    Model for a background job in the database-backed task queue
+    (see tasks.py). Successful tasks are deleted; failed ones are kept
+    for inspection.
+    
+    Fields:
+    - name: Registered task name (module path of the function)
+    - args: JSON list of positional arguments
+    - priority: Tasks with a higher priority run first
+    - status: queued, running or failed
+    - attempts: Number of times the task has been started
+    - max_attempts: Attempts allowed before the task is marked failed
+    - run_at: Earliest time the task may run (delays and retry backoff)
+    - locked_by: Worker running the task
+    - locked_at: When the worker claimed the task
+    - last_error: Traceback of the most recent failure
+    - created_at: When the task was enqueued
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_at = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'blog_task'
+        verbose_name = 'Task'
+        verbose_name_plural = 'Tasks'
+        indexes = [
+            # Claim order; only covers runnable rows
+            models.Index(
+                fields=['-priority', 'run_at', 'id'],
+                condition=models.Q(status='queued'),
+                name='blog_task_queued_idx'
+            ),
+            models.Index(
+                fields=['locked_at'],
+                condition=models.Q(status='running'),
+                name='blog_task_running_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name}{tuple(self.args)} [{self.status}]'
 
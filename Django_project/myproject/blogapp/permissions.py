@@ -37,7 +37,7 @@ class IsPostAuthor(permissions.BasePermission):
             return True
             
         # For other actions (update, delete), only allow the author of the post
-        return obj.author == request.user
+        return obj.author_id == request.user.id
 
 class IsSuperuserOrReadOnly(permissions.BasePermission):
     """
@@ -0,0 +1,91 @@
+"""
+Tag popularity for the blog application.
+
+Post counts per tag live in blog_tag_popularity and are adjusted as posts
+are tagged, untagged and deleted (see signals.py), so the tag cloud is a
+small indexed read instead of a GROUP BY over the Post.tags through table:
+- link_counts: Count existing Post.tags links per tag
+- adjust_tag_counts: Apply per-tag count deltas
+- get_popular_tags: Most used tags, highest count first
+- cache_key / bump_version: Versioned cache of the tag cloud
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F
+
+from .models import Post, TagPopularity
+
+
+VERSION_KEY = 'tag_popular:version'
+
+
+def link_counts(instance, reverse, pk_set=None):
+    """
+    Return {tag_id: number of links} for the Post.tags rows an m2m_changed
+    remove or clear is about to delete.
+    """
+    source, target = ('tag_id', 'post_id') if reverse else ('post_id', 'tag_id')
+    links = Post.tags.through.objects.filter(**{source: instance.pk})
+    if pk_set is not None:
+        links = links.filter(**{f'{target}__in': pk_set})
+    return dict(links.order_by().values_list('tag_id').annotate(n=Count('pk')))
+
+
+def adjust_tag_counts(deltas):
+    """
+    Add {tag_id: delta} to the stored post counts. Increments are a single
+    upsert; decrements never take a count below zero.
+    """
+    increments = [(tag_id, delta) for tag_id, delta in deltas.items() if delta > 0]
+    if increments:
+        table = connection.ops.quote_name(TagPopularity._meta.db_table)
+        values = ', '.join(['(%s, %s)'] * len(increments))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (tag_id, post_count) VALUES {values}
+                ON CONFLICT (tag_id) DO UPDATE SET
+                    post_count = {table}.post_count + excluded.post_count
+                """,
+                [param for increment in increments for param in increment]
+            )
+
+    for tag_id, delta in deltas.items():
+        if delta < 0:
+            TagPopularity.objects.filter(tag_id=tag_id, post_count__gte=-delta).update(
+                post_count=F('post_count') + delta
+            )
+
+
+def get_popular_tags(limit):
+    """
+    Return up to `limit` TagPopularity rows with their tags, most used first.
+    """
+    return (
+        TagPopularity.objects.filter(post_count__gt=0)
+        .select_related('tag')
+        .order_by('-post_count', 'tag_id')[:limit]
+    )
+
+
+def cache_key(limit):
+    """
+    Cache key for a tag cloud of `limit` tags at the current version.
+    """
+    # Seed missing versions with the clock so a lost version key can never
+    # resurrect entries cached under an older number
+    cache.add(VERSION_KEY, time.time_ns(), None)
+    return f'tag_popular:{cache.get(VERSION_KEY)}:{limit}'
+
+
+def bump_version():
+    """
+    Invalidate every cached tag cloud.
+    """
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,103 @@
+"""
+Soft-delete purging and archiving for the blog application.
+
+Deletes in the request path only flag rows (Post.soft_delete,
+Author.soft_delete); the cascades run here in small chunks, each in its own
+short transaction, so no single delete holds the database lock for long:
+- delete_in_chunks: Delete a queryset a chunk at a time
+- purge_author: Task removing a deleted author's content, then the author
+- purge_deleted: Task removing posts soft-deleted past the retention period
+- archive_posts: Move old posts into PostArchive
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Author, Post, PostArchive, Tag, TimelineEntry
+from .tasks import task
+
+
+def _chunk_size(chunk_size=None):
+    return chunk_size or getattr(settings, 'PURGE_CHUNK_SIZE', 500)
+
+
+def delete_in_chunks(queryset, chunk_size=None):
+    """
+    Delete every row matched by queryset, chunk_size rows per transaction,
+    and return the number of rows deleted (cascades not included).
+    """
+    chunk_size = _chunk_size(chunk_size)
+    manager = queryset.model._base_manager
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            manager.filter(pk__in=ids).delete()
+        deleted += len(ids)
+
+
+@task(priority=-5)
+def purge_author(author_id, chunk_size=None):
+    """
+    Remove a soft-deleted author's timeline, posts, archived posts and tags
+    chunk by chunk, then the (now small) author row itself.
+    """
+    if not Author.objects.filter(pk=author_id, deleted_at__isnull=False).exists():
+        return
+    delete_in_chunks(TimelineEntry.objects.filter(user_id=author_id), chunk_size)
+    delete_in_chunks(Post.all_objects.filter(author_id=author_id), chunk_size)
+    delete_in_chunks(PostArchive.objects.filter(author_id=author_id), chunk_size)
+    delete_in_chunks(Tag.objects.filter(created_by_id=author_id), chunk_size)
+    with transaction.atomic():
+        Author.objects.filter(pk=author_id).delete()
+
+
+@task(priority=-5)
+def purge_deleted(retention_days=None, chunk_size=None):
+    """
+    Remove posts soft-deleted more than SOFT_DELETE_RETENTION_DAYS ago.
+    """
+    if retention_days is None:
+        retention_days = getattr(settings, 'SOFT_DELETE_RETENTION_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    return delete_in_chunks(Post.all_objects.filter(deleted_at__lt=cutoff), chunk_size)
+
+
+def archive_posts(older_than_days=None, chunk_size=None):
+    """
+    Move live posts older than ARCHIVE_AFTER_DAYS into PostArchive, one
+    chunk per transaction, and return the number of posts archived.
+    """
+    if older_than_days is None:
+        older_than_days = getattr(settings, 'ARCHIVE_AFTER_DAYS', 365)
+    chunk_size = _chunk_size(chunk_size)
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    posts = Post.objects.filter(timestamp__lt=cutoff).order_by('pk')
+
+    archived = 0
+    while True:
+        chunk = list(posts.prefetch_related('tags')[:chunk_size])
+        if not chunk:
+            return archived
+        with transaction.atomic():
+            PostArchive.objects.bulk_create(
+                [
+                    PostArchive(
+                        id=post.id,
+                        title=post.title,
+                        content=post.content,
+                        timestamp=post.timestamp,
+                        author_id=post.author_id,
+                        tag_names=[tag.name for tag in post.tags.all()],
+                    )
+                    for post in chunk
+                ],
+                ignore_conflicts=True
+            )
+            Post.all_objects.filter(pk__in=[post.id for post in chunk]).delete()
+        archived += len(chunk)
@@ -6,10 +6,17 @@ This module contains the serializer classes that handle data serialization and d
 - AuthorSerializer: Handles user registration and profile management
 - TagSerializer: Manages tag data
 - PostSerializer: Handles blog post data
+- AuthorProfileSerializer: Public author profile with post/tag counts
+- PopularTagSerializer: Tag cloud entry with post count
+- TagDetailValuesSerializer, PostListValuesSerializer: Fast read-only list
+  serializers producing the same output as TagDetailSerializer and
+  PostListSerializer
 """
 
+from collections import defaultdict
+
 from rest_framework import serializers
-from .models import Author, Post, Tag
+from .models import Author, Post, Tag, TagPopularity
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 
@@ -25,8 +32,21 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     - user_id
     
     Methods:
+    - get_token: Adds identity claims used by stateless authentication
     - validate: Adds additional user information to the token response
     """
+    @classmethod
+    def get_token(cls, user):
+        """
+        Embed the claims BlogJWTAuthentication needs to build a
+        stateless user without a database lookup.
+        """
+        token = super().get_token(user)
+        token['username'] = user.username
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
         data['username'] = self.user.username
@@ -230,3 +250,131 @@ class PostListSerializer(serializers.ModelSerializer):
         read_only_fields = ['author', 'tags']
 
 
+class AuthorProfileSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for public author profiles and the leaderboard.
+    Counts come from the denormalized counters on Author, not aggregates.
+    
+    Fields:
+    - id: Author's unique identifier
+    - username: Author's username
+    - post_count: Number of posts written
+    - tag_count: Number of tags created
+    """
+    class Meta:
+        model = Author
+        fields = ['id', 'username', 'post_count', 'tag_count']
+        read_only_fields = fields
+
+
+class PopularTagSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for tag cloud entries, built from TagPopularity.
+    
+    Fields:
+    - id: Tag's unique identifier
+    - name: Tag name
+    - post_count: Number of posts with this tag
+    """
+    id = serializers.IntegerField(source='tag_id', read_only=True)
+    name = serializers.CharField(source='tag.name', read_only=True)
+
+    class Meta:
+        model = TagPopularity
+        fields = ['id', 'name', 'post_count']
+        read_only_fields = fields
+
+
+class ValuesListSerializer:
+    """
+    Read-only list serializer that builds plain dicts straight from
+    .values_list() rows, skipping model instances and per-field serializer
+    calls.
+
+    Subclasses mirror `model_serializer` exactly, key order included, so
+    the rendered JSON is byte-identical. Usage matches DRF:
+        data = PostListValuesSerializer(queryset).data
+    or, from async code, fetching rows with the async ORM:
+        data = await PostListValuesSerializer(queryset).adata()
+    """
+    model_serializer = None
+
+    def __init__(self, queryset):
+        # Instances are never built, so related-object loading is moot
+        self.queryset = queryset.select_related(None).prefetch_related(None)
+
+    @property
+    def data(self):
+        return self.to_representation(self.queryset)
+
+    async def adata(self):
+        return await self.ato_representation(self.queryset)
+
+    @staticmethod
+    async def arows(queryset, fields):
+        """
+        values_list(*fields) rows through the async ORM. Django 4.2 runs a
+        plain values_list() query eagerly, before aiterator() hands it to a
+        thread, so rows are fetched as namedtuples, which unpack the same.
+        """
+        return [row async for row in queryset.values_list(*fields, named=True).aiterator()]
+
+    def to_representation(self, queryset):
+        raise NotImplementedError
+
+    async def ato_representation(self, queryset):
+        raise NotImplementedError
+
+
+class TagDetailValuesSerializer(ValuesListSerializer):
+    """
+    Fast list counterpart of TagDetailSerializer (id, name).
+    """
+    model_serializer = TagDetailSerializer
+    fields = ('id', 'name')
+
+    def to_representation(self, queryset):
+        return self.from_rows(queryset.values_list(*self.fields))
+
+    async def ato_representation(self, queryset):
+        return self.from_rows(await self.arows(queryset, self.fields))
+
+    @staticmethod
+    def from_rows(rows):
+        return [{'id': id, 'name': name} for id, name in rows]
+
+
+class PostListValuesSerializer(ValuesListSerializer):
+    """
+    Fast list counterpart of PostListSerializer (id, title, content,
+    author username, tags). Tags for the whole page come from one query
+    shaped like the prefetch it replaces, so they keep the same order.
+    """
+    model_serializer = PostListSerializer
+    fields = ('id', 'title', 'content', 'author__username')
+    tag_fields = ('posts__id', 'id', 'name')
+
+    def to_representation(self, queryset):
+        rows = list(queryset.values_list(*self.fields))
+        tag_rows = self.tags_of(rows).values_list(*self.tag_fields) if rows else ()
+        return self.from_rows(rows, tag_rows)
+
+    async def ato_representation(self, queryset):
+        rows = await self.arows(queryset, self.fields)
+        tag_rows = await self.arows(self.tags_of(rows), self.tag_fields) if rows else ()
+        return self.from_rows(rows, tag_rows)
+
+    @staticmethod
+    def tags_of(rows):
+        return Tag.objects.filter(posts__in=[row[0] for row in rows])
+
+    @staticmethod
+    def from_rows(rows, tag_rows):
+        tags = defaultdict(list)
+        for post_id, tag_id, name in tag_rows:
+            tags[post_id].append({'id': tag_id, 'name': name})
+        return [
+            {'id': id, 'title': title, 'content': content, 'author': author, 'tags': tags[id]}
+            for id, title, content, author in rows
+        ]
+
@@ -0,0 +1,245 @@
+"""
+Signal handlers for the blog application.
+
+This module keeps derived state in sync with the models:
+- invalidate_cached_author: Drops an Author from the JWT user cache
+- fanout_new_post: Adds new posts to followers' timelines
+- fanout_tagged_post: Adds newly tagged posts to tag followers' timelines
+- touch_retagged_posts, touch_posts_with_tag, touch_author_content:
+  Bump updated_at on rows whose serialized form changed, so ETags change
+- remember_owner, count_created, count_deleted:
+  Keep Author.post_count / Author.tag_count in step with posts and tags
+- count_tag_links, uncount_deleted_post, invalidate_popular_tags:
+  Keep TagPopularity and the cached tag cloud in step with Post.tags
+- uncount_soft_deleted_post: Uncounts a post as soon as it is soft-deleted
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import feeds, popularity
+from .authentication import user_cache
+from .models import Author, Post, Tag
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_cached_author(sender, instance, **kwargs):
+    """
+    Drop the author from the in-process user cache whenever it changes,
+    so permission or password updates take effect on the next request.
+    """
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def fanout_new_post(sender, instance, created, **kwargs):
+    """
+    Write a newly created post into its readers' timelines.
+    """
+    if created:
+        feeds.schedule(feeds.fanout_post, instance.pk)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def fanout_tagged_post(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Write a post into the timelines of its new tags' followers.
+    """
+    if action != 'post_add' or not pk_set:
+        return
+    post_ids = pk_set if reverse else [instance.pk]
+    for post_id in post_ids:
+        feeds.schedule(feeds.fanout_post, post_id)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def touch_retagged_posts(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Bump updated_at on posts whose tag set changed.
+    """
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        Post.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+    elif reverse and action in ('post_add', 'post_remove') and pk_set:
+        Post.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+    elif reverse and action == 'pre_clear':
+        Post.objects.filter(tags=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def touch_posts_with_tag(sender, instance, created=False, **kwargs):
+    """
+    Bump updated_at on posts that embed a renamed or deleted tag.
+    """
+    if not created:
+        Post.objects.filter(tags=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Author)
+def touch_author_content(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Bump updated_at on posts and tags that embed the author's profile
+    when it may have changed.
+    """
+    if created:
+        return
+    if update_fields is not None and not {'username', 'email'} & set(update_fields):
+        return
+    now = timezone.now()
+    Post.objects.filter(author=instance).update(updated_at=now)
+    Tag.objects.filter(created_by=instance).update(updated_at=now)
+
+
+# Owner foreign key counted on Author for each model
+COUNTED_OWNERS = {
+    Post: ('author_id', 'post_count'),
+    Tag: ('created_by_id', 'tag_count'),
+}
+
+_UNKNOWN_OWNER = object()
+
+
+def adjust_count(author_id, counter, delta):
+    """
+    Atomically add delta to one of an author's denormalized counters,
+    never taking it below zero.
+    """
+    if author_id is None:
+        return
+    authors = Author.objects.filter(pk=author_id)
+    if delta < 0:
+        authors = authors.filter(**{f'{counter}__gte': -delta})
+    authors.update(**{counter: F(counter) + delta})
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=Tag)
+def remember_owner(sender, instance, update_fields=None, **kwargs):
+    """
+    Record the stored owner of an existing post or tag so a reassignment
+    can move the count between authors.
+    """
+    owner_field, _ = COUNTED_OWNERS[sender]
+    instance._stored_owner_id = _UNKNOWN_OWNER
+    if instance._state.adding:
+        return
+    if update_fields is not None and owner_field[:-3] not in update_fields:
+        return
+    instance._stored_owner_id = (
+        sender._base_manager.filter(pk=instance.pk)
+        .values_list(owner_field, flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Tag)
+def count_created(sender, instance, created, **kwargs):
+    """
+    Count a new post or tag, or move the count when its owner changed.
+    """
+    owner_field, counter = COUNTED_OWNERS[sender]
+    owner_id = getattr(instance, owner_field)
+    if getattr(instance, 'deleted_at', None) is not None:
+        return
+    if created:
+        adjust_count(owner_id, counter, 1)
+        return
+    stored_owner_id = getattr(instance, '_stored_owner_id', _UNKNOWN_OWNER)
+    if stored_owner_id is not _UNKNOWN_OWNER and stored_owner_id != owner_id:
+        adjust_count(stored_owner_id, counter, -1)
+        adjust_count(owner_id, counter, 1)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Tag)
+def count_deleted(sender, instance, **kwargs):
+    """
+    Uncount a deleted post or tag, unless it was already uncounted when
+    it was soft-deleted.
+    """
+    if getattr(instance, 'deleted_at', None) is not None:
+        return
+    owner_field, counter = COUNTED_OWNERS[sender]
+    adjust_count(getattr(instance, owner_field), counter, -1)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def count_tag_links(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Adjust per-tag post counts as posts gain or lose tags.
+
+    Removals are counted before the rows go, since pk_set may name links
+    that never existed; additions only ever report new links.
+    """
+    if action in ('pre_remove', 'pre_clear'):
+        instance._tag_link_deltas = {
+            tag_id: -count
+            for tag_id, count in popularity.link_counts(instance, reverse, pk_set).items()
+        }
+        return
+
+    if action == 'post_add' and pk_set:
+        deltas = {instance.pk: len(pk_set)} if reverse else Counter(pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        deltas = getattr(instance, '_tag_link_deltas', None)
+        instance._tag_link_deltas = None
+    else:
+        return
+
+    if deltas:
+        popularity.adjust_tag_counts(deltas)
+        transaction.on_commit(popularity.bump_version)
+
+
+@receiver(pre_delete, sender=Post)
+def uncount_deleted_post(sender, instance, **kwargs):
+    """
+    Uncount a deleted post's tags; its links are removed by cascade,
+    which does not send m2m_changed.
+    """
+    if instance.deleted_at is not None:
+        return
+    deltas = {
+        tag_id: -count
+        for tag_id, count in popularity.link_counts(instance, False).items()
+    }
+    if deltas:
+        popularity.adjust_tag_counts(deltas)
+        transaction.on_commit(popularity.bump_version)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_popular_tags(sender, instance, created=False, **kwargs):
+    """
+    Drop cached tag clouds when a listed tag is renamed or deleted.
+    """
+    if not created:
+        transaction.on_commit(popularity.bump_version)
+
+
+@receiver(post_save, sender=Post)
+def uncount_soft_deleted_post(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Uncount a post from its author and tags when it is soft-deleted, so
+    counts only cover live posts while the row awaits purge.
+    """
+    if created or not update_fields or 'deleted_at' not in update_fields:
+        return
+    if instance.deleted_at is None:
+        return
+    adjust_count(instance.author_id, 'post_count', -1)
+    deltas = {
+        tag_id: -count
+        for tag_id, count in popularity.link_counts(instance, False).items()
+    }
+    if deltas:
+        popularity.adjust_tag_counts(deltas)
+        transaction.on_commit(popularity.bump_version)
+
@@ -0,0 +1,153 @@
+"""
+Database-backed task queue for the blog application.
+
+Post-write side effects are stored as Task rows in the same transaction as
+the write that caused them and executed later by `manage.py runtasks`, so
+requests return without waiting for them and no broker service is needed:
+- task: Decorator registering a function as a task
+- enqueue: Queue a call to a registered task
+- claim_tasks: Atomically claim the next runnable tasks for a worker
+- run_task: Run a claimed task, retrying with backoff on failure
+- requeue_stale: Release tasks held by workers that died
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(func=None, *, priority=0, max_attempts=None):
+    """
+    Register a function as a task. Arguments must be JSON serializable.
+
+    Usage:
+        @task(priority=10)
+        def fanout_post(post_id): ...
+    """
+    def register(func):
+        func.task_name = f'{func.__module__}.{func.__qualname__}'
+        func.task_priority = priority
+        func.task_max_attempts = max_attempts
+        _registry[func.task_name] = func
+        return func
+
+    if func is not None:
+        return register(func)
+    return register
+
+
+def enqueue(func, *args, priority=None, delay=0):
+    """
+    Queue func(*args) to run in a worker, at least `delay` seconds from now.
+    The task row is written in the caller's transaction, so it only becomes
+    visible to workers once the triggering write commits.
+    """
+    if getattr(func, 'task_name', None) not in _registry:
+        raise ValueError(f'{func!r} is not a registered task')
+    max_attempts = func.task_max_attempts or getattr(settings, 'TASK_MAX_ATTEMPTS', 3)
+    return Task.objects.create(
+        name=func.task_name,
+        args=list(args),
+        priority=func.task_priority if priority is None else priority,
+        max_attempts=max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim_tasks(worker_id, limit):
+    """
+    Mark up to `limit` runnable tasks as running for `worker_id` and return
+    them, highest priority first. The claim is a single UPDATE, so two
+    workers never receive the same task.
+    """
+    now = timezone.now()
+    table = connection.ops.quote_name(Task._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table}
+            SET status = %s, locked_by = %s, locked_at = %s, attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM {table}
+                WHERE status = %s AND run_at <= %s
+                ORDER BY priority DESC, run_at, id
+                LIMIT %s
+            )
+            RETURNING id
+            """,
+            [
+                Task.RUNNING, worker_id, connection.ops.adapt_datetimefield_value(now),
+                Task.QUEUED, connection.ops.adapt_datetimefield_value(now), limit,
+            ]
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    if not ids:
+        return []
+    return list(Task.objects.filter(id__in=ids).order_by('-priority', 'run_at', 'id'))
+
+
+def run_task(task):
+    """
+    Run a claimed task. Successful tasks are deleted; failures are retried
+    with exponential backoff until max_attempts, then marked failed.
+    """
+    func = _registry.get(task.name)
+    try:
+        if func is None:
+            raise LookupError(f'Unknown task {task.name!r}')
+        func(*task.args)
+    except Exception:
+        logger.exception('Task %s (%s) failed, attempt %d of %d',
+                         task.pk, task.name, task.attempts, task.max_attempts)
+        changes = {'last_error': traceback.format_exc(), 'locked_by': '', 'locked_at': None}
+        if task.attempts < task.max_attempts:
+            backoff = getattr(settings, 'TASK_RETRY_BACKOFF', 5) * 2 ** (task.attempts - 1)
+            changes.update(status=Task.QUEUED, run_at=timezone.now() + timedelta(seconds=backoff))
+        else:
+            changes.update(status=Task.FAILED)
+        Task.objects.filter(pk=task.pk).update(**changes)
+        return False
+    Task.objects.filter(pk=task.pk).delete()
+    return True
+
+
+def run_in_worker(task):
+    """
+    Run a task on a worker thread with its own DB connection.
+    """
+    close_old_connections()
+    try:
+        return run_task(task)
+    finally:
+        close_old_connections()
+
+
+def requeue_stale(timeout=None):
+    """
+    Return tasks locked for longer than TASK_LOCK_TIMEOUT seconds (their
+    worker died) to the queue, or fail them if out of attempts.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'TASK_LOCK_TIMEOUT', 300)
+    stale = Task.objects.filter(
+        status=Task.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=timeout)
+    )
+    changes = {'locked_by': '', 'locked_at': None, 'last_error': 'Worker lock expired'}
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED, **changes
+    )
+    requeued = stale.update(status=Task.QUEUED, **changes)
+    return requeued, failed
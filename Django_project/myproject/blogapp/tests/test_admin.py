@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from ..admin import PostAdmin
+from ..middleware import QueryRecorder
+from ..models import Post, Tag
+
+
+class AdminChangeListTests(TestCase):
+    def setUp(self):
+        """Set up a superuser with tagged posts and log in"""
+        self.admin = get_user_model().objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.tag = Tag.objects.create(name='Django', created_by=self.admin)
+        self.posts = []
+        for i in range(5):
+            post = Post.objects.create(title=f'Post {i}', content='Content', author=self.admin)
+            post.tags.add(self.tag)
+            self.posts.append(post)
+        self.client.force_login(self.admin)
+
+    def titles(self, response):
+        return [post.title for post in response.context['cl'].result_list]
+
+    def test_cursor_navigation(self):
+        """Test changelists page newest-first with a primary key cursor"""
+        with mock.patch.object(PostAdmin, 'list_per_page', 2):
+            response = self.client.get('/admin/blogapp/post/')
+            self.assertEqual(self.titles(response), ['Post 4', 'Post 3'])
+            next_url = response.context['cl'].next_url
+            self.assertEqual(next_url, f'?before={self.posts[3].id}')
+
+            response = self.client.get('/admin/blogapp/post/' + next_url)
+            self.assertEqual(self.titles(response), ['Post 2', 'Post 1'])
+            self.assertContains(response, 'Next page')
+            self.assertContains(response, 'First page')
+
+    def test_query_count_independent_of_rows(self):
+        """Test author and tags are loaded in bulk, not per row"""
+        self.client.get('/admin/blogapp/post/')
+        with QueryRecorder() as few:
+            self.client.get('/admin/blogapp/post/')
+        for i in range(5):
+            post = Post.objects.create(title=f'More {i}', content='Content', author=self.admin)
+            post.tags.add(self.tag)
+        with QueryRecorder() as many:
+            self.client.get('/admin/blogapp/post/')
+        self.assertEqual(few.count, many.count)
+
+    @override_settings(ADMIN_COUNT_LIMIT=3)
+    def test_estimated_count(self):
+        """Test counts above the cap are estimated"""
+        response = self.client.get('/admin/blogapp/post/')
+        cl = response.context['cl']
+        self.assertTrue(cl.paginator.estimated)
+        self.assertGreaterEqual(cl.result_count, 5)
+        self.assertContains(response, f'~{cl.result_count}')
+
+    @override_settings(ADMIN_COUNT_LIMIT=3)
+    def test_filtered_count_is_a_lower_bound(self):
+        """Test searched lists above the cap report the cap, not the table size"""
+        Post.objects.create(title='Other', content='Content', author=self.admin)
+        response = self.client.get('/admin/blogapp/post/', {'q': 'post'})
+        cl = response.context['cl']
+        self.assertFalse(cl.paginator.estimated)
+        self.assertEqual(cl.result_count, 3)
+        self.assertContains(response, '3+ Posts')
+        self.assertContains(response, '3+ results')
+
+    def test_prefix_search(self):
+        """Test search matches case-insensitive prefixes"""
+        response = self.client.get('/admin/blogapp/post/', {'q': 'post 3'})
+        self.assertEqual(self.titles(response), ['Post 3'])
+        response = self.client.get('/admin/blogapp/tag/', {'q': 'DJ'})
+        self.assertEqual([tag.name for tag in response.context['cl'].result_list], ['Django'])
+        response = self.client.get('/admin/blogapp/author/', {'q': 'admin@'})
+        self.assertEqual(len(response.context['cl'].result_list), 1)
+
+    def test_sorting_falls_back_to_pages(self):
+        """Test sorting by a column uses the standard paginator"""
+        response = self.client.get('/admin/blogapp/post/', {'o': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['cl'].next_url)
@@ -0,0 +1,152 @@
+import threading
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from rest_framework_simplejwt.models import TokenUser
+from ..authentication import user_cache
+from ..backends import HashingPool, LoginBackpressure
+from ..middleware import QueryRecorder
+from ..serializers import CustomTokenObtainPairSerializer
+
+@override_settings(THROTTLE_PURGE_PROBABILITY=0)
+class JWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        """Set up a user with a token carrying identity claims"""
+        user_cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        token = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+    def test_token_contains_identity_claims(self):
+        """Test issued tokens carry the claims used by stateless users"""
+        token = CustomTokenObtainPairSerializer.get_token(self.user).access_token
+        self.assertEqual(token['username'], 'testuser')
+        self.assertFalse(token['is_superuser'])
+
+    def test_user_is_cached_between_requests(self):
+        """Test the second request does not load the author again"""
+        self.client.get('/api/authors/')
+        with QueryRecorder() as first:
+            self.client.get('/api/authors/')
+        user_cache.clear()
+        with QueryRecorder() as uncached:
+            self.client.get('/api/authors/')
+        self.assertEqual(first.count, uncached.count - 1)
+
+    def test_cache_invalidated_on_save(self):
+        """Test saving an author drops it from the user cache"""
+        self.client.get('/api/authors/')
+        self.assertIsNotNone(user_cache.get(self.user.id))
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(user_cache.get(self.user.id))
+        response = self.client.get('/api/authors/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(JWT_STATELESS_USER=True)
+    def test_stateless_user_for_reads(self):
+        """Test read requests authenticate without a database lookup"""
+        with QueryRecorder() as recorder:
+            response = self.client.get('/api/authors/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.wsgi_request.user, TokenUser)
+        # Throttle counter + author list, no user lookup
+        self.assertEqual(recorder.count, 2)
+
+    @override_settings(JWT_STATELESS_USER=True)
+    def test_stateless_user_not_used_for_writes(self):
+        """Test write requests still load the real author"""
+        response = self.client.post(
+            '/api/posts/', {'title': 'New Post', 'content': 'New Content'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['author']['username'], 'testuser')
+
+    def test_token_obtain(self):
+        """Test login through the offloaded backend"""
+        self.client.credentials()
+        response = self.client.post(
+            '/api/token/', {'username': 'testuser', 'password': 'testpass123'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user_id'], self.user.id)
+
+    def test_token_obtain_wrong_password(self):
+        """Test login with a wrong password is rejected"""
+        self.client.credentials()
+        response = self.client.post(
+            '/api/token/', {'username': 'testuser', 'password': 'wrong'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class SaturatedPool:
+    def run(self, func, *args):
+        raise LoginBackpressure()
+
+
+@mock.patch('blogapp.backends.get_hashing_pool', SaturatedPool)
+class LoginBackpressureTests(APITestCase):
+    def setUp(self):
+        """Set up a staff user"""
+        get_user_model().objects.create_superuser(
+            username='admin', email='admin@example.com', password='testpass123'
+        )
+
+    def test_token_view_returns_503(self):
+        """Test a saturated hashing pool makes token requests retryable"""
+        response = self.client.post(
+            '/api/token/', {'username': 'admin', 'password': 'testpass123'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertIn('detail', response.data)
+
+    def test_admin_login_returns_503(self):
+        """Test a saturated hashing pool is not a server error outside the API"""
+        response = self.client.post(
+            '/admin/login/', {'username': 'admin', 'password': 'testpass123'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+
+class HashingPoolTests(TestCase):
+    def test_saturated_pool_rejects(self):
+        """Test hashing beyond workers + backlog fails fast"""
+        pool = HashingPool(workers=1, backlog=0, timeout=5)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=pool.run, args=(block,))
+        worker.start()
+        started.wait(5)
+        with self.assertRaises(LoginBackpressure):
+            pool.run(lambda: None)
+        release.set()
+        worker.join()
+        self.assertEqual(pool.run(lambda: 42), 42)
+
+    def test_timed_out_hash_keeps_its_slot(self):
+        """Test a hash the caller stopped waiting for still occupies the pool"""
+        pool = HashingPool(workers=1, backlog=0, timeout=0.1)
+        release = threading.Event()
+
+        with self.assertRaises(LoginBackpressure):
+            pool.run(release.wait, 5)
+        with self.assertRaises(LoginBackpressure):
+            pool.run(lambda: None)
+        release.set()
+        # Runs after the abandoned hash on the single worker thread
+        pool._executor.submit(lambda: None).result(5)
+        self.assertEqual(pool.run(lambda: 42), 42)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..middleware import QueryRecorder
+from ..models import Author, Post, PostArchive, Tag, TagPopularity, Task
+from ..retention import archive_posts, delete_in_chunks, purge_author, purge_deleted
+
+
+@override_settings(THROTTLE_PURGE_PROBABILITY=0)
+class SoftDeleteTests(APITestCase):
+    def setUp(self):
+        """Set up an author with tagged posts and an authenticated client"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.tag = Tag.objects.create(name='Tag', created_by=self.user)
+        self.posts = []
+        for i in range(3):
+            post = Post.objects.create(title=f'Post {i}', content='Content', author=self.user)
+            post.tags.add(self.tag)
+            self.posts.append(post)
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_post_delete_is_soft(self):
+        """Test deleting a post hides it and uncounts it, keeping the row"""
+        response = self.client.delete(f'/api/posts/{self.posts[0].id}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(Post.all_objects.deleted().count(), 1)
+        self.assertEqual(
+            self.client.get(f'/api/posts/{self.posts[0].id}/').status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(Author.objects.get(pk=self.user.pk).post_count, 2)
+        self.assertEqual(TagPopularity.objects.get(tag=self.tag).post_count, 2)
+
+    def test_purge_deleted_respects_retention(self):
+        """Test purge only removes posts deleted before the cutoff"""
+        self.posts[0].soft_delete()
+        self.posts[1].soft_delete()
+        Post.all_objects.filter(pk=self.posts[0].pk).update(
+            deleted_at=timezone.now() - timedelta(days=30)
+        )
+
+        self.assertEqual(purge_deleted(retention_days=7, chunk_size=1), 1)
+        self.assertFalse(Post.all_objects.filter(pk=self.posts[0].pk).exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.posts[1].pk).exists())
+        # Counts were already adjusted at soft-delete time
+        self.assertEqual(Author.objects.get(pk=self.user.pk).post_count, 1)
+        self.assertEqual(TagPopularity.objects.get(tag=self.tag).post_count, 1)
+
+    def test_author_delete_is_constant_and_queued(self):
+        """Test deleting an author only flags it and queues the purge"""
+        with QueryRecorder() as recorder:
+            response = self.client.delete(f'/api/authors/{self.user.id}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        # Independent of how many posts the author has
+        self.assertLessEqual(recorder.count, 8)
+
+        author = Author.objects.get(pk=self.user.pk)
+        self.assertFalse(author.is_active)
+        self.assertIsNotNone(author.deleted_at)
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(
+            Task.objects.get(name=purge_author.task_name).args, [self.user.pk]
+        )
+
+        call_command('runtasks', once=True, concurrency=1, stdout=StringIO())
+        self.assertFalse(Author.objects.filter(pk=self.user.pk).exists())
+        self.assertEqual(Post.all_objects.count(), 0)
+        self.assertEqual(Tag.objects.count(), 0)
+
+    def test_purge_author_ignores_live_authors(self):
+        """Test the purge task never touches an author that is not deleted"""
+        purge_author(self.user.pk)
+        self.assertEqual(Post.objects.count(), 3)
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        """Set up an author with an old and a new post"""
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.tag = Tag.objects.create(name='Tag', created_by=self.user)
+        self.old = Post.objects.create(title='Old', content='Content', author=self.user)
+        self.old.tags.add(self.tag)
+        Post.objects.filter(pk=self.old.pk).update(
+            timestamp=timezone.now() - timedelta(days=400)
+        )
+        self.new = Post.objects.create(title='New', content='Content', author=self.user)
+
+    def test_delete_in_chunks(self):
+        """Test chunked deletes remove every matched row"""
+        self.assertEqual(delete_in_chunks(Post.objects.all(), chunk_size=1), 2)
+        self.assertEqual(Post.all_objects.count(), 0)
+
+    def test_archive_posts(self):
+        """Test old posts move to the archive with their tag names"""
+        self.assertEqual(archive_posts(older_than_days=365, chunk_size=1), 1)
+        self.assertEqual(list(Post.objects.all()), [self.new])
+        archived = PostArchive.objects.get()
+        self.assertEqual((archived.id, archived.title), (self.old.id, 'Old'))
+        self.assertEqual(archived.tag_names, ['Tag'])
+
+    def test_purgedeleted_command(self):
+        """Test the command purges and archives"""
+        out = StringIO()
+        call_command('purgedeleted', archive_after_days=365, stdout=out)
+        self.assertIn('Purged 0 deleted posts', out.getvalue())
+        self.assertIn('Archived 1 posts', out.getvalue())
@@ -2,10 +2,12 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from ..models import Post, Tag
 from ..serializers import (
     AuthorSerializer, PostSerializer, TagSerializer,
-    PostListSerializer, TagDetailSerializer
+    PostListSerializer, TagDetailSerializer,
+    PostListValuesSerializer, TagDetailValuesSerializer
 )
 
 class SerializerTests(TestCase):
@@ -95,4 +97,54 @@ class SerializerTests(TestCase):
         }
         serializer = TagSerializer(data=invalid_data)
         self.assertFalse(serializer.is_valid())
-        self.assertIn('created_by_id', serializer.errors) 
\ No newline at end of file
+        self.assertIn('created_by_id', serializer.errors)
+
+
+class ValuesSerializerTests(TestCase):
+    def setUp(self):
+        """Set up posts with zero, one and several tags across two authors"""
+        users = [
+            get_user_model().objects.create_user(
+                username=f'user{i}',
+                email=f'user{i}@example.com',
+                password='testpass123'
+            )
+            for i in range(2)
+        ]
+        tags = [
+            Tag.objects.create(name=f'Tag "{i}" \u00e9', created_by=users[0])
+            for i in range(4)
+        ]
+        for i in range(6):
+            post = Post.objects.create(
+                title=f'Post {i}', content=f'Content \u2603 {i}', author=users[i % 2]
+            )
+            post.tags.add(*tags[:i % 5])
+        Post.objects.first().soft_delete()
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_post_list_output_is_byte_identical(self):
+        """Test the values serializer renders exactly like PostListSerializer"""
+        queryset = Post.objects.select_related('author').prefetch_related('tags')
+        expected = self.render(PostListSerializer(queryset, many=True).data)
+        self.assertEqual(self.render(PostListValuesSerializer(queryset).data), expected)
+
+    def test_tag_list_output_is_byte_identical(self):
+        """Test the values serializer renders exactly like TagDetailSerializer"""
+        queryset = Tag.objects.all()
+        expected = self.render(TagDetailSerializer(queryset, many=True).data)
+        self.assertEqual(self.render(TagDetailValuesSerializer(queryset).data), expected)
+
+    def test_post_list_uses_two_queries(self):
+        """Test posts and all their tags are read with one query each"""
+        with self.assertNumQueries(2):
+            PostListValuesSerializer(Post.objects.all()).data
+
+    def test_empty_queryset(self):
+        """Test empty lists skip the tag query"""
+        Post.objects.all().delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(PostListValuesSerializer(Post.objects.all()).data, [])
+
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from ..models import Post, Task, TimelineEntry
+from ..tasks import claim_tasks, enqueue, requeue_stale, run_task, task
+
+calls = []
+
+
+@task
+def record(value):
+    calls.append(value)
+
+
+@task(priority=5, max_attempts=2)
+def explode():
+    raise RuntimeError('boom')
+
+
+def unregistered():
+    pass
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_requires_registered_task(self):
+        """Test only registered functions can be queued"""
+        with self.assertRaises(ValueError):
+            enqueue(unregistered)
+
+    def test_claim_order_and_delay(self):
+        """Test tasks are claimed by priority, skipping delayed ones"""
+        low = enqueue(record, 'low')
+        high = enqueue(record, 'high', priority=9)
+        enqueue(record, 'later', delay=60)
+
+        claimed = claim_tasks('worker-1', 10)
+        self.assertEqual([t.id for t in claimed], [high.id, low.id])
+        self.assertTrue(all(t.status == Task.RUNNING and t.attempts == 1 for t in claimed))
+        self.assertEqual(claim_tasks('worker-2', 10), [])
+
+    def test_run_task_success_deletes(self):
+        """Test successful tasks run with their arguments and are removed"""
+        enqueue(record, 'value')
+        self.assertTrue(run_task(claim_tasks('worker', 1)[0]))
+        self.assertEqual(calls, ['value'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_run_task_retries_then_fails(self):
+        """Test failures back off and are kept once out of attempts"""
+        queued = enqueue(explode)
+        with self.assertLogs('blogapp.tasks', 'ERROR'):
+            self.assertFalse(run_task(claim_tasks('worker', 1)[0]))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.QUEUED)
+        self.assertGreater(queued.run_at, timezone.now())
+        self.assertIn('boom', queued.last_error)
+
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs('blogapp.tasks', 'ERROR'):
+            self.assertFalse(run_task(claim_tasks('worker', 1)[0]))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.FAILED)
+        self.assertEqual(queued.attempts, 2)
+
+    def test_requeue_stale(self):
+        """Test tasks abandoned by dead workers return to the queue"""
+        enqueue(record, 'value')
+        claim_tasks('dead-worker', 1)
+        Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(timeout=60), (1, 0))
+        self.assertEqual(Task.objects.get().status, Task.QUEUED)
+
+    def test_runtasks_command(self):
+        """Test the worker command drains the queue with --once"""
+        enqueue(record, 'a')
+        enqueue(record, 'b', priority=1)
+        out = StringIO()
+        call_command('runtasks', once=True, concurrency=1, stdout=out)
+        self.assertEqual(calls, ['b', 'a'])
+        self.assertIn('2 tasks run, 0 failed', out.getvalue())
+
+    @override_settings(FEED_FANOUT_ASYNC=True)
+    def test_post_fanout_is_queued(self):
+        """Test creating a post queues its fan-out instead of running it"""
+        author = get_user_model().objects.create_user(
+            username='writer',
+            email='writer@example.com',
+            password='testpass123'
+        )
+        post = Post.objects.create(title='Post', content='Content', author=author)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(Task.objects.get().args, [post.id])
+
+        call_command('runtasks', once=True, concurrency=1, stdout=StringIO())
+        self.assertTrue(TimelineEntry.objects.filter(user=author, post=post).exists())
@@ -0,0 +1,93 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..models import ThrottleCounter
+from ..throttling import (
+    SlidingWindowUserRateThrottle, get_rejection_metrics, hit_counter
+)
+
+class FakeClockThrottle(SlidingWindowUserRateThrottle):
+    rate = '3/min'
+    now_value = 1_000_000.0
+
+    def timer(self):
+        return FakeClockThrottle.now_value
+
+
+class ThrottleTests(TestCase):
+    def setUp(self):
+        """Set up a user and a request for direct throttle checks"""
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.request = APIRequestFactory().get('/api/posts/')
+        self.request.user = self.user
+        FakeClockThrottle.now_value = 60 * 100_000.0
+
+    def check(self):
+        return FakeClockThrottle().allow_request(self.request, None)
+
+    def test_counter_rolls_over_windows(self):
+        """Test counts move to the previous window and reset after a gap"""
+        self.assertEqual(hit_counter('k', 10, 0), (1, 0))
+        self.assertEqual(hit_counter('k', 10, 0), (2, 0))
+        self.assertEqual(hit_counter('k', 11, 0), (1, 2))
+        self.assertEqual(hit_counter('k', 13, 0), (1, 0))
+        self.assertEqual(ThrottleCounter.objects.count(), 1)
+
+    def test_rejects_over_limit(self):
+        """Test requests beyond the rate are rejected and counted"""
+        self.assertEqual([self.check() for _ in range(4)], [True, True, True, False])
+        self.assertEqual(get_rejection_metrics(), {'user': 1})
+
+    def test_sliding_window_weights_previous(self):
+        """Test the previous window still counts, decaying over time"""
+        for _ in range(3):
+            self.check()
+        # A quarter into the next window 3 * 0.75 + 1 > 3
+        FakeClockThrottle.now_value += 75
+        self.assertFalse(self.check())
+        # Two windows later the old counts no longer matter
+        FakeClockThrottle.now_value += 120
+        self.assertTrue(self.check())
+
+    def test_wait(self):
+        """Test wait reports the time left in the window"""
+        throttle = FakeClockThrottle()
+        throttle.allow_request(self.request, None)
+        self.assertEqual(throttle.wait(), 60)
+
+
+class ThrottleMetricsViewTests(APITestCase):
+    def setUp(self):
+        """Set up a staff user and a regular user"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.superuser = get_user_model().objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123'
+        )
+
+    def test_metrics_for_staff(self):
+        """Test staff can read rejection metrics"""
+        refresh = RefreshToken.for_user(self.superuser)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        response = self.client.get('/api/throttle/metrics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'rejected': {}})
+
+    def test_metrics_forbidden_for_users(self):
+        """Test regular users cannot read rejection metrics"""
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        response = self.client.get('/api/throttle/metrics/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,9 +1,21 @@
-from django.test import TestCase
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient, force_authenticate
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from ..models import Post, Tag
+from .. import exports
+from ..models import Author, Post, Tag, TagPopularity
+from ..views import PostViewSet, TagViewSet
+from ..middleware import QueryRecorder
+from .utils import QueryBudgetMixin
 
 class APITests(APITestCase):
     def setUp(self):
@@ -161,4 +173,637 @@ class APITests(APITestCase):
         
         # Test delete access (should be forbidden)
         delete_response = self.client.delete(detail_url)
-        self.assertEqual(delete_response.status_code, status.HTTP_403_FORBIDDEN) 
\ No newline at end of file
+        self.assertEqual(delete_response.status_code, status.HTTP_403_FORBIDDEN) 
+
+@override_settings(THROTTLE_PURGE_PROBABILITY=0)
+class QueryBudgetTests(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        """Set up several authors, tags and posts so N+1 queries show up"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        for i in range(5):
+            author = get_user_model().objects.create_user(
+                username=f'author{i}',
+                email=f'author{i}@example.com',
+                password='testpass123'
+            )
+            tag = Tag.objects.create(name=f'Tag {i}', created_by=self.user)
+            post = Post.objects.create(
+                title=f'Post {i}',
+                content='Content',
+                author=author
+            )
+            post.tags.add(tag)
+        self.post = post
+        self.tag = tag
+
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_post_list_budget(self):
+        """Test post list stays within its query budget"""
+        with self.assertWithinQueryBudget(PostViewSet, 'list'):
+            response = self.client.get('/api/posts/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 5)
+
+    def test_post_retrieve_budget(self):
+        """Test post detail stays within its query budget"""
+        with self.assertWithinQueryBudget(PostViewSet, 'retrieve'):
+            response = self.client.get(f'/api/posts/{self.post.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_tag_list_budget(self):
+        """Test tag list stays within its query budget"""
+        with self.assertWithinQueryBudget(TagViewSet, 'list'):
+            response = self.client.get('/api/tags/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_tag_retrieve_budget(self):
+        """Test tag detail loads its creator without an extra query"""
+        with self.assertWithinQueryBudget(TagViewSet, 'retrieve'):
+            response = self.client.get(f'/api/tags/{self.tag.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created_by']['username'], 'testuser')
+
+    @override_settings(QUERY_COUNT_HEADERS=True)
+    def test_query_count_headers(self):
+        """Test query count and budget are reported in debug headers"""
+        response = self.client.get('/api/posts/')
+        self.assertIn('X-Query-Count', response)
+        self.assertIn('X-Query-Time', response)
+        self.assertEqual(
+            response['X-Query-Budget'], str(PostViewSet.query_budgets['list'])
+        )
+
+    @override_settings(QUERY_COUNT_HEADERS=False)
+    def test_query_count_headers_disabled(self):
+        """Test query headers are not sent when disabled"""
+        response = self.client.get('/api/posts/')
+        self.assertNotIn('X-Query-Count', response)
+
+
+@override_settings(FEED_FANOUT_ASYNC=False, THROTTLE_PURGE_PROBABILITY=0)
+class FeedTests(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        """Set up a reader, a followed author and a followed tag"""
+        self.client = APIClient()
+        self.reader = get_user_model().objects.create_user(
+            username='reader',
+            email='reader@example.com',
+            password='testpass123'
+        )
+        self.author = get_user_model().objects.create_user(
+            username='writer',
+            email='writer@example.com',
+            password='testpass123'
+        )
+        self.stranger = get_user_model().objects.create_user(
+            username='stranger',
+            email='stranger@example.com',
+            password='testpass123'
+        )
+        self.tag = Tag.objects.create(name='Followed Tag', created_by=self.author)
+        self.reader.following.add(self.author)
+        self.reader.followed_tags.add(self.tag)
+
+        refresh = RefreshToken.for_user(self.reader)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def create_post(self, author, title, tags=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(title=title, content='Content', author=author)
+            post.tags.add(*tags)
+        return post
+
+    def test_feed_contains_followed_posts(self):
+        """Test feed has posts by followed authors and with followed tags"""
+        by_author = self.create_post(self.author, 'By author')
+        tagged = self.create_post(self.stranger, 'Tagged', tags=[self.tag])
+        self.create_post(self.stranger, 'Unrelated')
+
+        with self.assertWithinQueryBudget(PostViewSet, 'feed'):
+            response = self.client.get('/api/posts/feed/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post['id'] for post in response.data['results']],
+            [tagged.id, by_author.id]
+        )
+        self.assertIsNone(response.data['next'])
+
+    def test_feed_pagination(self):
+        """Test feed pages with the before cursor"""
+        posts = [self.create_post(self.author, f'Post {i}') for i in range(3)]
+
+        response = self.client.get('/api/posts/feed/', {'limit': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['next'], posts[1].id)
+
+        response = self.client.get(
+            '/api/posts/feed/', {'limit': 2, 'before': response.data['next']}
+        )
+        self.assertEqual(
+            [post['id'] for post in response.data['results']], [posts[0].id]
+        )
+
+    def test_feed_skips_soft_deleted_posts(self):
+        """Test soft-deleted posts neither shorten a page nor end pagination"""
+        posts = [self.create_post(self.author, f'Post {i}') for i in range(4)]
+        posts[3].soft_delete()
+        posts[2].soft_delete()
+
+        response = self.client.get('/api/posts/feed/', {'limit': 1})
+        self.assertEqual(
+            [post['id'] for post in response.data['results']], [posts[1].id]
+        )
+        self.assertEqual(response.data['next'], posts[1].id)
+
+        response = self.client.get(
+            '/api/posts/feed/', {'limit': 1, 'before': response.data['next']}
+        )
+        self.assertEqual(
+            [post['id'] for post in response.data['results']], [posts[0].id]
+        )
+
+    def test_feed_invalid_cursor(self):
+        """Test non-integer cursors are rejected"""
+        response = self.client.get('/api/posts/feed/', {'before': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        """Test following an author backfills the feed and unfollowing prunes it"""
+        post = self.create_post(self.stranger, 'Earlier post')
+        url = f'/api/authors/{self.stranger.id}/follow/'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        feed = self.client.get('/api/posts/feed/')
+        self.assertEqual([p['id'] for p in feed.data['results']], [post.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        feed = self.client.get('/api/posts/feed/')
+        self.assertEqual(feed.data['results'], [])
+
+    def test_follow_tag_as_regular_user(self):
+        """Test regular users can follow tags"""
+        other_tag = Tag.objects.create(name='Other Tag', created_by=self.author)
+        response = self.client.post(f'/api/tags/{other_tag.id}/follow/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(other_tag, self.reader.followed_tags.all())
+
+    def test_cannot_follow_self(self):
+        """Test following yourself is rejected"""
+        response = self.client.post(f'/api/authors/{self.reader.id}/follow/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(THROTTLE_PURGE_PROBABILITY=0)
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        """Set up a post with a tag and authenticate as its author"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.tag = Tag.objects.create(name='Test Tag', created_by=self.user)
+        self.post = Post.objects.create(
+            title='Test Post',
+            content='Test Content',
+            author=self.user
+        )
+        self.post.tags.add(self.tag)
+        self.url = f'/api/posts/{self.post.id}/'
+
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_retrieve_sets_validators(self):
+        """Test post detail carries a weak ETag and Last-Modified"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+
+    def test_retrieve_not_modified(self):
+        """Test a matching If-None-Match gets a 304 after one lookup (plus throttle)"""
+        etag = self.client.get(self.url)['ETag']
+        with QueryRecorder() as recorder:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(recorder.count, 2)
+
+    def test_retrieve_if_modified_since(self):
+        """Test a current If-Modified-Since gets a 304"""
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_update_changes_etag(self):
+        """Test editing a post invalidates its ETag"""
+        etag = self.client.get(self.url)['ETag']
+        self.client.patch(self.url, {'title': 'Updated Post'}, format='json')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Updated Post')
+
+    def test_tag_rename_changes_post_etag(self):
+        """Test renaming an embedded tag invalidates the post's ETag"""
+        etag = self.client.get(self.url)['ETag']
+        self.tag.name = 'Renamed Tag'
+        self.tag.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['tags'][0]['name'], 'Renamed Tag')
+
+    def test_list_not_modified(self):
+        """Test post list returns 304 until a post is deleted"""
+        etag = self.client.get('/api/posts/')['ETag']
+        response = self.client.get('/api/posts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Post.objects.create(title='Other Post', content='Content', author=self.user).delete()
+        self.post.delete()
+        response = self.client.get('/api/posts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_tag_list_not_modified(self):
+        """Test tag list supports conditional GET"""
+        etag = self.client.get('/api/tags/')['ETag']
+        response = self.client.get('/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        """Set up data and a token for the async endpoints"""
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.other_user = get_user_model().objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='otherpass123'
+        )
+        self.tag = Tag.objects.create(name='Test Tag', created_by=self.user)
+        self.other_tag = Tag.objects.create(name='Other Tag', created_by=self.other_user)
+        self.post = Post.objects.create(
+            title='Test Post',
+            content='Test Content',
+            author=self.user
+        )
+        self.post.tags.add(self.tag)
+        token = RefreshToken.for_user(self.user).access_token
+        self.auth = {'AUTHORIZATION': f'Bearer {token}'}
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    async def test_async_post_list_matches_sync(self):
+        """Test async post list returns the same payload as the DRF view"""
+        response = await self.async_client.get('/api/async/posts/', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sync_response = await sync_to_async(self.client.get)('/api/posts/')
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response['ETag'], sync_response['ETag'])
+
+    async def test_async_post_detail(self):
+        """Test async post detail and conditional GET"""
+        url = f'/api/async/posts/{self.post.id}/'
+        response = await self.async_client.get(url, headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['author']['username'], 'testuser')
+        self.assertEqual(response.json()['tags'], [{'id': self.tag.id, 'name': 'Test Tag'}])
+
+        response = await self.async_client.get(
+            url, headers={**self.auth, 'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_async_tag_list(self):
+        """Test async tag list"""
+        response = await self.async_client.get('/api/async/tags/', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 2)
+
+    async def test_async_tag_detail_visibility(self):
+        """Test regular users only see their own tags in detail"""
+        own = await self.async_client.get(f'/api/async/tags/{self.tag.id}/', headers=self.auth)
+        self.assertEqual(own.status_code, status.HTTP_200_OK)
+        self.assertEqual(own.json()['created_by']['username'], 'testuser')
+        other = await self.async_client.get(
+            f'/api/async/tags/{self.other_tag.id}/', headers=self.auth
+        )
+        self.assertEqual(other.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_requires_authentication(self):
+        """Test async endpoints reject anonymous and invalid requests"""
+        response = await self.async_client.get('/api/async/posts/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(
+            '/api/async/posts/', headers={'AUTHORIZATION': 'Bearer invalid'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_async_rejects_writes(self):
+        """Test async endpoints are read-only"""
+        response = await self.async_client.post('/api/async/posts/', headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+@override_settings(THROTTLE_PURGE_PROBABILITY=0)
+class AuthorStatsTests(APITestCase):
+    def setUp(self):
+        """Set up three authors with different amounts of content"""
+        self.client = APIClient()
+        self.users = [
+            get_user_model().objects.create_user(
+                username=f'author{i}',
+                email=f'author{i}@example.com',
+                password='testpass123'
+            )
+            for i in range(3)
+        ]
+        refresh = RefreshToken.for_user(self.users[0])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def counts(self, user):
+        return Author.objects.values_list('post_count', 'tag_count').get(pk=user.pk)
+
+    def test_counts_follow_creates_and_deletes(self):
+        """Test counters are maintained on create and delete"""
+        post = Post.objects.create(title='Post', content='Content', author=self.users[0])
+        tag = Tag.objects.create(name='Tag', created_by=self.users[0])
+        self.assertEqual(self.counts(self.users[0]), (1, 1))
+
+        post.delete()
+        tag.delete()
+        self.assertEqual(self.counts(self.users[0]), (0, 0))
+
+    def test_counts_follow_reassignment(self):
+        """Test changing a post's author moves the count"""
+        post = Post.objects.create(title='Post', content='Content', author=self.users[0])
+        post.author = self.users[1]
+        post.save()
+        self.assertEqual(self.counts(self.users[0]), (0, 0))
+        self.assertEqual(self.counts(self.users[1]), (1, 0))
+
+        post.title = 'Renamed'
+        post.save(update_fields=['title'])
+        self.assertEqual(self.counts(self.users[1]), (1, 0))
+
+    def test_profile_update_keeps_counts(self):
+        """Test saving a stale author instance does not reset its counters"""
+        stale = Author.objects.get(pk=self.users[0].pk)
+        Post.objects.create(title='Post', content='Content', author=self.users[0])
+
+        stale.first_name = 'Renamed'
+        stale.save()
+        self.assertEqual(self.counts(self.users[0]), (1, 0))
+
+        response = self.client.patch(
+            f'/api/authors/{self.users[0].id}/', {'email': 'new@example.com'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(self.users[0]), (1, 0))
+        self.assertEqual(
+            Author.objects.values_list('first_name', 'email').get(pk=self.users[0].pk),
+            ('Renamed', 'new@example.com')
+        )
+
+    def test_create_through_api_counts(self):
+        """Test posts created through the API are counted"""
+        response = self.client.post(
+            '/api/posts/', {'title': 'API post', 'content': 'Content'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.counts(self.users[0]), (1, 0))
+
+    def test_profile(self):
+        """Test any author's profile is readable in a single query"""
+        Tag.objects.create(name='Tag', created_by=self.users[1])
+        with QueryRecorder() as recorder:
+            response = self.client.get(f'/api/authors/{self.users[1].id}/profile/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'id': self.users[1].id,
+            'username': 'author1',
+            'post_count': 0,
+            'tag_count': 1
+        })
+        # Authentication + throttle + profile
+        self.assertLessEqual(recorder.count, 3)
+
+    def test_leaderboard_ordering_and_paging(self):
+        """Test leaderboard ranks by count and pages with the cursor"""
+        for user, posts in zip(self.users, (1, 3, 2)):
+            for i in range(posts):
+                Post.objects.create(title=f'Post {i}', content='Content', author=user)
+
+        response = self.client.get('/api/authors/leaderboard/', {'limit': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [author['username'] for author in response.data['results']],
+            ['author1', 'author2']
+        )
+        self.assertEqual(response.data['next'], f'2:{self.users[2].id}')
+
+        response = self.client.get(
+            '/api/authors/leaderboard/', {'limit': 2, 'cursor': response.data['next']}
+        )
+        self.assertEqual(
+            [author['username'] for author in response.data['results']],
+            ['author0']
+        )
+        self.assertIsNone(response.data['next'])
+
+    def test_leaderboard_by_tags(self):
+        """Test leaderboard can rank by tag count"""
+        Tag.objects.create(name='Tag', created_by=self.users[2])
+        response = self.client.get('/api/authors/leaderboard/', {'by': 'tags', 'limit': 1})
+        self.assertEqual(response.data['results'][0]['username'], 'author2')
+
+    def test_leaderboard_rejects_bad_parameters(self):
+        """Test invalid ranking fields and cursors are rejected"""
+        response = self.client.get('/api/authors/leaderboard/', {'by': 'likes'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/authors/leaderboard/', {'cursor': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(THROTTLE_PURGE_PROBABILITY=0)
+class TagPopularityTests(QueryBudgetMixin, APITestCase):
+    def setUp(self):
+        """Set up a user, three tags and an authenticated client"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.tags = [
+            Tag.objects.create(name=f'Tag {i}', created_by=self.user) for i in range(3)
+        ]
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def create_post(self, *tags):
+        post = Post.objects.create(title='Post', content='Content', author=self.user)
+        post.tags.add(*tags)
+        return post
+
+    def counts(self):
+        return dict(TagPopularity.objects.values_list('tag_id', 'post_count'))
+
+    def test_counts_follow_tag_changes(self):
+        """Test counters track add, remove, clear, reverse add and delete"""
+        first, second, third = self.tags
+        post = self.create_post(first, second)
+        self.assertEqual(self.counts(), {first.id: 1, second.id: 1})
+
+        post.tags.remove(second, third)
+        self.assertEqual(self.counts(), {first.id: 1, second.id: 0})
+
+        third.posts.add(post, self.create_post())
+        self.assertEqual(self.counts()[third.id], 2)
+
+        post.tags.clear()
+        self.assertEqual(self.counts(), {first.id: 0, second.id: 0, third.id: 1})
+
+        Post.objects.filter(tags=third).delete()
+        self.assertEqual(self.counts()[third.id], 0)
+
+    def test_popular_tags(self):
+        """Test tag cloud ranks tags by post count within budget"""
+        first, second, _ = self.tags
+        self.create_post(first, second)
+        self.create_post(second)
+
+        with self.assertWithinQueryBudget(TagViewSet, 'popular'):
+            response = self.client.get('/api/tags/popular/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [
+            {'id': second.id, 'name': 'Tag 1', 'post_count': 2},
+            {'id': first.id, 'name': 'Tag 0', 'post_count': 1},
+        ])
+
+        response = self.client.get('/api/tags/popular/', {'limit': 1})
+        self.assertEqual([tag['id'] for tag in response.data], [second.id])
+
+    def test_popular_tags_cache_invalidation(self):
+        """Test cached tag clouds are versioned out by tag changes"""
+        first = self.tags[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_post(first)
+        self.client.get('/api/tags/popular/')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tags/popular/')
+        # Counters come from the cache
+        self.assertFalse(any('blog_tag_popularity' in q['sql'] for q in queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_post(first)
+            first.name = 'Renamed'
+            first.save()
+        response = self.client.get('/api/tags/popular/')
+        self.assertEqual(response.data, [
+            {'id': first.id, 'name': 'Renamed', 'post_count': 2},
+        ])
+
+
+@override_settings(THROTTLE_PURGE_PROBABILITY=0)
+class ExportTests(APITestCase):
+    def setUp(self):
+        """Set up an author with a few tagged posts"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            username='exporter',
+            email='exporter@example.com',
+            password='testpass123'
+        )
+        self.tags = [
+            Tag.objects.create(name=name, created_by=self.user) for name in ('alpha', 'beta')
+        ]
+        self.posts = []
+        for i in range(5):
+            post = Post.objects.create(title=f'Post {i}', content=f'Content, "{i}"', author=self.user)
+            post.tags.add(*self.tags[:i % 3])
+            self.posts.append(post)
+
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def export(self, **params):
+        response = self.client.get('/api/posts/export/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode()
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_ndjson_matches_list(self):
+        """Test the NDJSON export streams the list payload in id order"""
+        rows = [json.loads(line) for line in self.export().splitlines()]
+        listed = self.client.get('/api/posts/').json()
+        self.assertEqual(rows, sorted(listed, key=lambda post: post['id']))
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_resume_after_id(self):
+        """Test ?after= resumes after the last id received"""
+        rows = [json.loads(line) for line in self.export(after=self.posts[2].id).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [post.id for post in self.posts[3:]])
+
+    def test_csv(self):
+        """Test the CSV export has a header row and joined tag names"""
+        rows = list(csv.reader(io.StringIO(self.export(type='csv'))))
+        self.assertEqual(rows[0], ['id', 'title', 'content', 'author', 'tags'])
+        self.assertEqual(rows[2], [str(self.posts[1].id), 'Post 1', 'Content, "1"', 'exporter', 'alpha'])
+        self.assertEqual(rows[3][4], 'alpha|beta')
+        self.assertEqual(len(rows), 6)
+
+    def test_soft_deleted_posts_are_skipped(self):
+        """Test soft-deleted posts are not exported"""
+        self.posts[0].soft_delete()
+        rows = [json.loads(line) for line in self.export().splitlines()]
+        self.assertNotIn(self.posts[0].id, [row['id'] for row in rows])
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_queries_per_chunk(self):
+        """Test each chunk costs one post query and one tag query"""
+        with CaptureQueriesContext(connection) as queries:
+            list(exports.iter_posts())
+        # Batches of 2, 2 and 1 posts
+        self.assertEqual(len(queries), 6)
+
+    def test_invalid_parameters(self):
+        """Test unknown types and non-integer cursors are rejected"""
+        self.assertEqual(
+            self.client.get('/api/posts/export/', {'type': 'xml'}).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.client.get('/api/posts/export/', {'after': 'x'}).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_requires_authentication(self):
+        """Test anonymous users cannot export"""
+        self.client.credentials()
+        response = self.client.get('/api/posts/export/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,18 @@
+from contextlib import contextmanager
+from ..middleware import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """Assertions for the per-action query budgets declared on viewsets"""
+
+    @contextmanager
+    def assertWithinQueryBudget(self, viewset, action):
+        """Fail if the block runs more queries than viewset.query_budgets[action]"""
+        budget = viewset.query_budgets[action]
+        with QueryRecorder() as recorder:
+            yield recorder
+        self.assertLessEqual(
+            recorder.count, budget,
+            f'{viewset.__name__}.{action} ran {recorder.count} queries '
+            f'(budget {budget})'
+        )
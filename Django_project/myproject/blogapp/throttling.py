@@ -0,0 +1,153 @@
+"""
+Throttle classes for the blog application.
+
+DRF's built-in throttles keep a growing list of timestamps per client in the
+local cache, so limits are per process and every check rewrites the list.
+The classes here keep a fixed-size sliding-window counter per client in the
+database instead:
+- hit_counter: Atomically bumps a counter and returns the window counts
+- record_rejection / get_rejection_metrics: Per-scope rejection metrics
+- SlidingWindowThrottleMixin: O(1) sliding-window check shared by workers
+- SlidingWindowAnonRateThrottle / SlidingWindowUserRateThrottle
+"""
+
+import random
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from .models import ThrottleCounter, ThrottleRejection
+
+
+def _throttle_connection():
+    return connections[getattr(settings, 'THROTTLE_DATABASE', 'default')]
+
+
+def hit_counter(key, window_index, expires_at):
+    """
+    Count one request for `key` in `window_index` and return the
+    (current, previous) window counts, in a single atomic upsert.
+
+    When the stored window is older than `window_index` the counters roll
+    over: the old current count becomes the previous one if the windows are
+    adjacent, otherwise both restart.
+    """
+    connection = _throttle_connection()
+    table = connection.ops.quote_name(ThrottleCounter._meta.db_table)
+    key_column = connection.ops.quote_name('key')
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({key_column}, window_index, current, previous, expires_at)
+            VALUES (%s, %s, 1, 0, %s)
+            ON CONFLICT ({key_column}) DO UPDATE SET
+                previous = CASE
+                    WHEN {table}.window_index = excluded.window_index THEN {table}.previous
+                    WHEN {table}.window_index = excluded.window_index - 1 THEN {table}.current
+                    ELSE 0 END,
+                current = CASE
+                    WHEN {table}.window_index = excluded.window_index THEN {table}.current + 1
+                    ELSE 1 END,
+                window_index = excluded.window_index,
+                expires_at = excluded.expires_at
+            RETURNING current, previous
+            """,
+            [key, window_index, expires_at]
+        )
+        current, previous = cursor.fetchone()
+    return current, previous
+
+
+def purge_expired(now):
+    """
+    Delete counters that no longer influence any decision at Unix time `now`.
+    """
+    ThrottleCounter.objects.using(
+        getattr(settings, 'THROTTLE_DATABASE', 'default')
+    ).filter(expires_at__lt=now).delete()
+
+
+def record_rejection(scope):
+    """
+    Increment the shared rejection counter for a throttle scope.
+    """
+    connection = _throttle_connection()
+    table = connection.ops.quote_name(ThrottleRejection._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (scope, count) VALUES (%s, 1)
+            ON CONFLICT (scope) DO UPDATE SET count = {table}.count + 1
+            """,
+            [scope]
+        )
+
+
+def get_rejection_metrics():
+    """
+    Return {scope: rejected request count} across all workers.
+    """
+    return dict(
+        ThrottleRejection.objects.using(
+            getattr(settings, 'THROTTLE_DATABASE', 'default')
+        ).values_list('scope', 'count')
+    )
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Replaces SimpleRateThrottle's timestamp history with a sliding-window
+    counter: the request rate is estimated as
+
+        previous_window_count * (1 - elapsed / duration) + current_window_count
+
+    which needs two integers per client and one upsert per check. Every
+    request attempt is counted, so clients that keep hammering while
+    throttled stay throttled.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window_index, self.elapsed = divmod(self.now, self.duration)
+        window_index = int(window_index)
+        expires_at = (window_index + 2) * self.duration
+
+        current, previous = hit_counter(self.key, window_index, expires_at)
+        if random.random() < getattr(settings, 'THROTTLE_PURGE_PROBABILITY', 0.01):
+            purge_expired(int(self.now))
+
+        estimate = previous * (1 - self.elapsed / self.duration) + current
+        if estimate > self.num_requests:
+            record_rejection(self.scope)
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """
+        Seconds until the current window rolls over, after which the
+        previous window's weight starts to decay.
+        """
+        return self.duration - self.elapsed
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    """
+    Limits anonymous clients by IP address (scope "anon").
+    """
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    """
+    Limits authenticated users by id (scope "user").
+    """
@@ -4,27 +4,35 @@ Views for the blog application.
 This module contains the view classes that handle HTTP requests and responses:
 - AuthorViewSet: Handles user registration and profile management
 - TagViewSet: Manages tag creation and listing
-- PostViewSet: Handles blog post operations
+- PostViewSet: Handles blog post operations and the streaming export
 - CustomTokenObtainPairView: Custom JWT token generation
+- throttle_metrics: Per-scope throttle rejection counts
 """
 
-from rest_framework.decorators import api_view, action
+from rest_framework.decorators import api_view, action, permission_classes
 from rest_framework.response import Response
 from rest_framework import viewsets, status, permissions
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.core.cache import cache
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 
+from . import exports, feeds, popularity, retention, tasks
+
+from .backends import LoginBackpressure
+from .mixins import ConditionalGetMixin
 from .models import Author, Post, Tag
 from .serializers import (
     AuthorSerializer, PostSerializer, TagSerializer, 
     CustomTokenObtainPairSerializer, AuthorListSerializer, 
-    PostListSerializer, TagDetailSerializer
+    PostListSerializer, TagDetailSerializer, AuthorProfileSerializer,
+    PopularTagSerializer, PostListValuesSerializer, TagDetailValuesSerializer
 )
 from .permissions import ( IsSuperuserOrReadOnly, IsPostAuthor)     
-from rest_framework.permissions import IsAuthenticated
+from .throttling import get_rejection_metrics
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 
 class AuthorViewSet(viewsets.ModelViewSet):
@@ -37,7 +45,10 @@ class AuthorViewSet(viewsets.ModelViewSet):
     - GET /api/authors/: List all authors (usernames only)
     - GET /api/authors/{id}/: Get author details
     - PUT /api/authors/{id}/: Update author profile
-    - DELETE /api/authors/{id}/: Delete author account
+    - DELETE /api/authors/{id}/: Delete author account (content is purged in the background)
+    - POST/DELETE /api/authors/{id}/follow/: Follow or unfollow an author
+    - GET /api/authors/{id}/profile/: Public profile with post/tag counts
+    - GET /api/authors/leaderboard/: Authors ranked by post or tag count
     
     Permissions:
     - Registration: Public access
@@ -63,6 +74,8 @@ class AuthorViewSet(viewsets.ModelViewSet):
         """
         if self.action == 'list':
             return AuthorListSerializer
+        if self.action in ('profile', 'leaderboard'):
+            return AuthorProfileSerializer
         return AuthorSerializer
 
     def get_queryset(self):
@@ -71,7 +84,7 @@ class AuthorViewSet(viewsets.ModelViewSet):
         For other actions, only show authenticated user's data.
         """
         if self.action == 'list':
-            return Author.objects.all()
+            return Author.objects.filter(deleted_at__isnull=True)
         elif self.request.user.is_authenticated:
             return Author.objects.filter(id=self.request.user.id)
         return Author.objects.none()
@@ -109,12 +122,14 @@ class AuthorViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         """
-        Perform hard delete of the author.
+        Soft-delete the author and queue the purge of their content.
         Only allowed for the author's own account.
         """
         try:
             instance = self.get_object()
-            instance.delete()
+            with transaction.atomic():
+                instance.soft_delete()
+                tasks.enqueue(retention.purge_author, instance.pk)
             return Response("User deleted successfully", status=status.HTTP_204_NO_CONTENT)
         except Exception as e:
             return Response(
@@ -140,8 +155,84 @@ class AuthorViewSet(viewsets.ModelViewSet):
                 }, status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=['post', 'delete'])
+    def follow(self, request, pk=None):
+        """
+        Follow (POST) or unfollow (DELETE) an author.
+        Their posts are backfilled into, or pruned from, the caller's feed
+        in the background.
+        """
+        author = get_object_or_404(Author, pk=pk, deleted_at__isnull=True)
+        if author.id == request.user.id:
+            return Response(
+                {'detail': 'You cannot follow yourself'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.method == 'POST':
+            request.user.following.add(author)
+            feeds.schedule(feeds.backfill_timeline, request.user.id, author.id)
+            return Response({'detail': f'Following {author.username}'})
+
+        request.user.following.remove(author)
+        feeds.schedule(feeds.prune_timeline, request.user.id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['get'])
+    def profile(self, request, pk=None):
+        """
+        Get any author's public profile with post and tag counts.
+        """
+        author = get_object_or_404(
+            Author.objects.only('id', 'username', 'post_count', 'tag_count'),
+            pk=pk, deleted_at__isnull=True
+        )
+        return Response(self.get_serializer(author).data)
+
+    @action(detail=False, methods=['get'])
+    def leaderboard(self, request):
+        """
+        List authors ranked by post count (?by=posts, default) or tag count
+        (?by=tags), read straight off the counter index.
+        Paginate with ?cursor=<next>&limit=<n>.
+        """
+        counter = {'posts': 'post_count', 'tags': 'tag_count'}.get(
+            request.query_params.get('by', 'posts')
+        )
+        if counter is None:
+            return Response(
+                {'detail': 'by must be "posts" or "tags"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-class TagViewSet(viewsets.ModelViewSet):
+        authors = Author.objects.filter(deleted_at__isnull=True).only(
+            'id', 'username', 'post_count', 'tag_count'
+        )
+        try:
+            limit = int(request.query_params.get('limit', settings.LEADERBOARD_PAGE_SIZE))
+            cursor = request.query_params.get('cursor')
+            if cursor:
+                count, author_id = (int(part) for part in cursor.split(':'))
+                # Resume after the last (count, id) pair seen
+                authors = authors.filter(**{f'{counter}__lte': count}).exclude(
+                    **{counter: count, 'id__gte': author_id}
+                )
+        except ValueError:
+            return Response(
+                {'detail': 'limit and cursor must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, settings.LEADERBOARD_MAX_PAGE_SIZE))
+
+        page = list(authors.order_by(f'-{counter}', '-id')[:limit])
+        last = page[-1] if len(page) == limit else None
+        return Response({
+            'results': self.get_serializer(page, many=True).data,
+            'next': f'{getattr(last, counter)}:{last.id}' if last else None
+        })
+
+
+class TagViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Tag model.
     Handles tag creation, management, and listing.
@@ -152,18 +243,28 @@ class TagViewSet(viewsets.ModelViewSet):
     - GET /api/tags/{id}/: Get tag details
     - PUT /api/tags/{id}/: Update tag
     - DELETE /api/tags/{id}/: Delete tag
+    - POST/DELETE /api/tags/{id}/follow/: Follow or unfollow a tag
+    - GET /api/tags/popular/: Tag cloud, most used tags first
     
     Permissions:
     - Read operations: Requires authentication
     - Write operations: Requires superuser status
+
+    Query budgets:
+    - list/retrieve: 4 queries (authentication + throttle + validators + tags)
+    - popular: 3 queries (authentication + throttle + counters on a cache miss)
+
+    Caching:
+    - list/retrieve support ETag / Last-Modified and return 304 when unchanged
+    - list data is cached per ETag version
+    - popular data is cached per counter version
     """
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [IsAuthenticated, IsSuperuserOrReadOnly]
-
-    @method_decorator(cache_page(settings.CACHE_TTL))
-    def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+    query_budgets = {'list': 4, 'retrieve': 4, 'popular': 3}
+    list_cache_key = 'tag_list'
+    values_serializer_class = TagDetailValuesSerializer
 
     def get_serializer_class(self):
         """
@@ -171,15 +272,18 @@ class TagViewSet(viewsets.ModelViewSet):
         """
         if self.action == 'list':
             return TagDetailSerializer
+        if self.action == 'popular':
+            return PopularTagSerializer
         return TagSerializer
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """
         Automatically set the creator when creating a new tag.
+        Runs in a transaction with the creator's tag_count update.
+        Cached lists are versioned by ETag, so nothing is cleared here.
         """
         serializer.save(created_by=self.request.user)
-        # Clear cache when new tag is created
-        cache.clear()
 
     def get_queryset(self):
         """
@@ -189,12 +293,53 @@ class TagViewSet(viewsets.ModelViewSet):
         """
         if self.action == 'list':
             return Tag.objects.all()
+        queryset = Tag.objects.select_related('created_by')
         if self.request.user.is_superuser:
-            return Tag.objects.all()
-        return Tag.objects.filter(created_by=self.request.user)
+            return queryset.all()
+        return queryset.filter(created_by_id=self.request.user.id)
 
+    @action(detail=True, methods=['post', 'delete'], permission_classes=[IsAuthenticated])
+    def follow(self, request, pk=None):
+        """
+        Follow (POST) or unfollow (DELETE) a tag.
+        Tagged posts are backfilled into, or pruned from, the caller's feed
+        in the background.
+        """
+        tag = get_object_or_404(Tag, pk=pk)
+
+        if request.method == 'POST':
+            request.user.followed_tags.add(tag)
+            feeds.schedule(feeds.backfill_timeline, request.user.id, None, tag.id)
+            return Response({'detail': f'Following {tag.name}'})
+
+        request.user.followed_tags.remove(tag)
+        feeds.schedule(feeds.prune_timeline, request.user.id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-class PostViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def popular(self, request):
+        """
+        List the most used tags with their post counts (?limit=<n>),
+        read from the TagPopularity counters.
+        """
+        try:
+            limit = int(request.query_params.get('limit', settings.TAG_CLOUD_SIZE))
+        except ValueError:
+            return Response(
+                {'detail': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, settings.TAG_CLOUD_MAX_SIZE))
+
+        cache_key = popularity.cache_key(limit)
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_serializer(popularity.get_popular_tags(limit), many=True).data
+            cache.set(cache_key, data, settings.CACHE_TTL)
+        return Response(data)
+
+
+class PostViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Post model.
     Handles post creation, management, and listing.
@@ -204,15 +349,29 @@ class PostViewSet(viewsets.ModelViewSet):
     - POST /api/posts/: Create a new post
     - GET /api/posts/{id}/: Get post details
     - PUT /api/posts/{id}/: Update post
-    - DELETE /api/posts/{id}/: Delete post
+    - DELETE /api/posts/{id}/: Delete post (soft delete, purged later)
+    - GET /api/posts/feed/: Posts by followed authors or with followed tags
+    - GET /api/posts/export/: Stream every post as NDJSON or CSV
     
     Permissions:
     - Read operations: Requires authentication
     - Write operations: Requires post author status
+
+    Query budgets:
+    - list/retrieve: 5 queries (authentication + throttle + validators + posts + prefetched tags)
+    - feed: 5 queries (authentication + throttle + timeline page + posts + prefetched tags)
+    - export: 2 queries per EXPORT_CHUNK_SIZE posts, run while streaming
+
+    Caching:
+    - list/retrieve support ETag / Last-Modified and return 304 when unchanged
+    - list data is cached per ETag version
     """
     queryset = Post.objects.select_related('author').prefetch_related('tags').all()
     serializer_class = PostSerializer
     permission_classes = [IsPostAuthor]
+    query_budgets = {'list': 5, 'retrieve': 5, 'feed': 5}
+    list_cache_key = 'post_list'
+    values_serializer_class = PostListValuesSerializer
 
     def get_queryset(self):
         """
@@ -227,31 +386,82 @@ class PostViewSet(viewsets.ModelViewSet):
         """
         Use different serializer for list action to show simplified data.
         """
-        if self.action == 'list':
+        if self.action in ('list', 'feed'):
             return PostListSerializer
         return PostSerializer
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """
         Automatically set the author when creating a new post.
+        Runs in a transaction with the tag links and the author's
+        post_count update. Timeline fan-out is queued as a background
+        task in the same transaction (see feeds.py).
         """
         serializer.save(author=self.request.user)
-        # Clear cache when new post is created
-        cache.clear()
 
-    def list(self, request, *args, **kwargs):
+    @transaction.atomic
+    def perform_destroy(self, instance):
         """
-        List all posts with caching.
+        Soft-delete the post: it disappears from every list, feed and
+        detail lookup at once, and purgedeleted removes the row later.
         """
-        cache_key = 'post_list'
-        cached_data = cache.get(cache_key)
-        
-        if cached_data is None:
-            response = super().list(request, *args, **kwargs)
-            cache.set(cache_key, response.data, settings.CACHE_TTL)
-            return response
-            
-        return Response(cached_data)
+        instance.soft_delete()
+
+    @action(detail=False, methods=['get'])
+    def feed(self, request):
+        """
+        List posts from the caller's precomputed timeline, newest first.
+        Paginate with ?before=<post id>&limit=<n>; the response's `next`
+        value is the `before` for the following page.
+        """
+        try:
+            before = request.query_params.get('before')
+            before = int(before) if before is not None else None
+            limit = int(request.query_params.get('limit', settings.FEED_PAGE_SIZE))
+        except ValueError:
+            return Response(
+                {'detail': 'before and limit must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, settings.FEED_MAX_PAGE_SIZE))
+
+        posts, next_before = feeds.get_feed(request.user.id, before=before, limit=limit)
+        serializer = self.get_serializer(posts, many=True)
+        return Response({
+            'results': serializer.data,
+            'next': next_before
+        })
+
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream every post in id order as NDJSON (?type=ndjson, default) or
+        CSV (?type=csv), without building the list in memory or caching it.
+        Resume an interrupted export with ?after=<last id received>.
+        """
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type not in exports.EXPORT_FORMATS:
+            return Response(
+                {'detail': f'type must be one of: {", ".join(exports.EXPORT_FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            after = int(request.query_params.get('after', 0))
+        except ValueError:
+            return Response(
+                {'detail': 'after must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        encode, content_type, extension = exports.EXPORT_FORMATS[export_type]
+        response = StreamingHttpResponse(
+            encode(exports.iter_posts(after=after)), content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="posts.{extension}"'
+        response['Cache-Control'] = 'no-store'
+        return response
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -268,6 +478,30 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     - username: User's username
     - email: User's email
     - user_id: User's ID
+
+    Returns 503 with Retry-After when password hashing is saturated.
     """
     serializer_class = CustomTokenObtainPairSerializer
 
+    def post(self, request, *args, **kwargs):
+        try:
+            return super().post(request, *args, **kwargs)
+        except LoginBackpressure as exc:
+            return Response(
+                {'detail': str(exc)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': '1'}
+            )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def throttle_metrics(request):
+    """
+    Return the number of throttled requests per scope across all workers.
+    
+    Endpoint:
+    - GET /api/throttle/metrics/: Staff only
+    """
+    return Response({'rejected': get_rejection_metrics()})
+
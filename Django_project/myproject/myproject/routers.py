@@ -0,0 +1,66 @@
+"""
+Read-replica routing for the blog project.
+
+Enabled with DATABASE_READ_REPLICA in settings.py:
+- ReadReplicaMiddleware: Marks GET/HEAD requests as read-only
+- ReadReplicaRouter: Sends ORM reads made during those requests to the
+  read-only 'replica' connection; all writes stay on 'default'
+"""
+
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+
+_read_only_request = ContextVar('read_only_request', default=False)
+
+READ_ONLY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReadReplicaMiddleware:
+    """
+    Flags safe requests so their reads are routed to the replica.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_only_request.set(request.method in READ_ONLY_METHODS)
+        try:
+            return self.get_response(request)
+        finally:
+            _read_only_request.reset(token)
+
+    async def __acall__(self, request):
+        token = _read_only_request.set(request.method in READ_ONLY_METHODS)
+        try:
+            return await self.get_response(request)
+        finally:
+            _read_only_request.reset(token)
+
+
+class ReadReplicaRouter:
+    """
+    Routes reads in read-only requests to 'replica', everything else to
+    'default'. Both aliases point at the same SQLite file, so there is no
+    replication lag; the replica connection is opened with mode=ro.
+    """
+
+    def db_for_read(self, model, **hints):
+        return 'replica' if _read_only_request.get() else 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
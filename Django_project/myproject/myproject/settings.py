@@ -57,6 +57,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blogapp.middleware.QueryCountMiddleware',
+    'blogapp.middleware.LoginBackpressureMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -92,11 +94,39 @@ WSGI_APPLICATION = 'myproject.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # django.db.backends.sqlite3 plus per-connection PRAGMAs
+        'ENGINE': 'myproject.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests instead of reconnecting each time
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'PRAGMAS': {
+            'journal_mode': 'WAL',  # readers and the writer no longer block each other
+            'synchronous': 'NORMAL',  # safe with WAL; fsync only at checkpoints
+            'busy_timeout': 5000,  # ms to wait for the write lock before failing
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64000,  # negative = KiB, i.e. 64 MB page cache
+            'temp_store': 'MEMORY',
+        },
     }
 }
 
+# Route reads made by GET/HEAD requests to a read-only connection
+# (see myproject/routers.py). The test database mirrors 'default' through a
+# separate connection, which cannot see TestCase's uncommitted rows, so keep
+# this off when running the test suite.
+DATABASE_READ_REPLICA = False
+
+if DATABASE_READ_REPLICA:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': f"file:{DATABASES['default']['NAME']}?mode=ro",
+        'OPTIONS': {'uri': True},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['myproject.routers.ReadReplicaRouter']
+    MIDDLEWARE.insert(1, 'myproject.routers.ReadReplicaMiddleware')
+
 
 # =====================
 # Password Validation
@@ -144,6 +174,17 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'blogapp.Author'
 
+# Check login passwords on a bounded hashing pool instead of the request thread
+AUTHENTICATION_BACKENDS = [
+    'blogapp.backends.OffloadedModelBackend',
+]
+
+# Number of concurrent password hashes, queued hashes beyond that, and
+# seconds to wait before answering 503
+LOGIN_HASH_WORKERS = 4
+LOGIN_HASH_BACKLOG = 16
+LOGIN_HASH_TIMEOUT = 10
+
 
 # =====================
 # REST Framework Settings
@@ -152,7 +193,7 @@ AUTH_USER_MODEL = 'blogapp.Author'
 REST_FRAMEWORK = {
     # Authentication settings
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'blogapp.authentication.BlogJWTAuthentication',
     ),
     
     # Permission settings
@@ -160,10 +201,10 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     
-    # Throttling settings
+    # Throttling settings (sliding-window counters shared by all workers)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'blogapp.throttling.SlidingWindowAnonRateThrottle',
+        'blogapp.throttling.SlidingWindowUserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/day',  # 100 requests per day for anonymous users
@@ -172,6 +213,12 @@ REST_FRAMEWORK = {
 }
 
 
+# Database alias holding throttle counters, and the chance that a check
+# also purges expired counters
+THROTTLE_DATABASE = 'default'
+THROTTLE_PURGE_PROBABILITY = 0.01
+
+
 # =====================
 # JWT Settings
 # =====================
@@ -205,6 +252,12 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Build a stateless user from token claims for read-only requests (no DB hit)
+JWT_STATELESS_USER = False
+
+# Seconds an authenticated Author stays in the in-process user cache
+JWT_USER_CACHE_TTL = 30
+
 
 # =====================
 # Cache Settings
@@ -219,3 +272,74 @@ CACHES = {
 
 # Cache timeout settings (in seconds)
 CACHE_TTL = 60 * 15  # 15 minutes
+
+# Build post and tag lists from .values_list() rows instead of DRF serializers
+FAST_LIST_SERIALIZERS = True
+
+
+# =====================
+# Query Instrumentation
+# =====================
+
+# Report SQL query count/time as X-Query-* response headers
+QUERY_COUNT_HEADERS = DEBUG
+
+
+# =====================
+# Feed Settings
+# =====================
+
+# Queue timeline writes as tasks after commit; a `manage.py runtasks` worker
+# must be running to apply them (False: write inline in on_commit)
+FEED_FANOUT_ASYNC = True
+FEED_FANOUT_BATCH_SIZE = 500
+
+# Posts copied into a timeline when following an author or tag
+FEED_BACKFILL_SIZE = 50
+
+FEED_PAGE_SIZE = 20
+FEED_MAX_PAGE_SIZE = 100
+
+
+# =====================
+# Task Queue Settings
+# =====================
+
+TASK_WORKER_CONCURRENCY = 2
+TASK_POLL_INTERVAL = 1.0  # seconds between polls of an empty queue
+TASK_MAX_ATTEMPTS = 3
+TASK_RETRY_BACKOFF = 5  # seconds, doubled after every failed attempt
+TASK_LOCK_TIMEOUT = 300  # seconds before a running task is considered abandoned
+
+
+# =====================
+# Retention Settings
+# =====================
+
+SOFT_DELETE_RETENTION_DAYS = 7
+ARCHIVE_AFTER_DAYS = 365
+PURGE_CHUNK_SIZE = 500
+
+
+# =====================
+# Admin Settings
+# =====================
+
+ADMIN_COUNT_LIMIT = 10000  # changelists estimate row counts above this
+
+
+# =====================
+# Stats Settings
+# =====================
+
+LEADERBOARD_PAGE_SIZE = 20
+LEADERBOARD_MAX_PAGE_SIZE = 100
+TAG_CLOUD_SIZE = 50
+TAG_CLOUD_MAX_SIZE = 200
+
+
+# =====================
+# Export Settings
+# =====================
+
+EXPORT_CHUNK_SIZE = 2000  # posts fetched per query by GET /api/posts/export/
@@ -0,0 +1,26 @@
+"""
+SQLite database backend for the blog project.
+
+Django's sqlite3 backend (4.2) has no hook for per-connection setup, so
+this subclass applies the PRAGMAs listed in the database's PRAGMAS setting
+every time a connection is opened, e.g.:
+
+    'PRAGMAS': {'journal_mode': 'WAL', 'busy_timeout': 5000}
+
+journal_mode is skipped on read-only (mode=ro) connections, which cannot
+change it.
+"""
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        read_only = 'mode=ro' in str(self.settings_dict['NAME'])
+        for name, value in self.settings_dict.get('PRAGMAS', {}).items():
+            if read_only and name == 'journal_mode':
+                continue
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
@@ -5,6 +5,7 @@ This module defines the URL patterns for the entire project:
 - Admin interface URLs
 - API endpoints for blog functionality
 - JWT authentication endpoints
+- Async read-only endpoints for posts and tags
 
 The `urlpatterns` list routes URLs to views. For more information please see:
 https://docs.djangoproject.com/en/5.2/topics/http/urls/
@@ -14,11 +15,13 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
+from blogapp import async_views
 from blogapp.views import (
     AuthorViewSet, 
     PostViewSet, 
     TagViewSet, 
-    CustomTokenObtainPairView
+    CustomTokenObtainPairView,
+    throttle_metrics
 )
 
 
@@ -50,5 +53,14 @@ urlpatterns = [
     # JWT Authentication endpoints
     path('api/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+
+    # Throttle rejection metrics (staff only)
+    path('api/throttle/metrics/', throttle_metrics, name='throttle_metrics'),
+
+    # Async read-only endpoints (serve from ASGI without a thread per request)
+    path('api/async/posts/', async_views.post_list, name='async_post_list'),
+    path('api/async/posts/<int:pk>/', async_views.post_detail, name='async_post_detail'),
+    path('api/async/tags/', async_views.tag_list, name='async_tag_list'),
+    path('api/async/tags/<int:pk>/', async_views.tag_detail, name='async_tag_detail'),
 ]
 
@@ -0,0 +1,57 @@
+"""Response compression negotiated from Accept-Encoding.
+
+    init_compression(app)
+
+Compresses finished (non-streamed) responses whose type is in
+COMPRESS_MIMETYPES and whose body is at least COMPRESS_MIN_SIZE bytes, using
+the best encoding both sides support: brotli when the brotli package is
+installed, otherwise gzip. Smaller bodies are sent as they are, since
+compressing them costs more CPU than it saves in bytes.
+"""
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first; more can be registered, e.g. COMPRESSORS['zstd'] = ...
+COMPRESSORS = {}
+if brotli is not None:
+    COMPRESSORS['br'] = lambda data, level: brotli.compress(data, quality=min(level, 11))
+COMPRESSORS['gzip'] = lambda data, level: gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def init_compression(app):
+    app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+    app.config.setdefault('COMPRESS_LEVEL', 6)
+    app.config.setdefault('COMPRESS_MIMETYPES', {'application/json', 'text/html', 'text/plain'})
+
+    @app.after_request
+    def compress_response(response):
+        response.vary.add('Accept-Encoding')
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in app.config['COMPRESS_MIMETYPES']
+            or not 200 <= response.status_code < 300
+        ):
+            return response
+        encoding = negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(COMPRESSORS[encoding](data, app.config['COMPRESS_LEVEL']))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def negotiate(accept_encodings):
+    for encoding in COMPRESSORS:
+        if accept_encodings[encoding] > 0:
+            return encoding
+    return None
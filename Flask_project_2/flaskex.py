@@ -1,6 +1,10 @@
 from flask import Flask, request, jsonify
+from jsonprovider import FastJSONProvider
+from compression import init_compression
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson when installed
+init_compression(app)  # gzip/brotli for JSON bodies of COMPRESS_MIN_SIZE bytes or more
 
 @app.route("/", methods=["GET"])
 def home():
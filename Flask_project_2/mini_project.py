@@ -1,9 +1,24 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context, url_for
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, literal, select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects import postgresql, sqlite
+from dbconfig import configure_database, install_sqlite_pragmas
+from permissions import RoleResolver
+from jsonprovider import FastJSONProvider, Serializer
+from compression import init_compression
 
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'  
+app.json = FastJSONProvider(app)  # orjson when installed
+init_compression(app)  # gzip/brotli for JSON bodies of COMPRESS_MIN_SIZE bytes or more
+configure_database(app, 'sqlite:///app.db', prefix='MINI_PROJECT_')  # engine options and SQLite PRAGMAs from MINI_PROJECT_* env vars
+app.config['BULK_BATCH_SIZE'] = 500  # rows per INSERT and per id-validation query
+app.config['BULK_MAX_ITEMS'] = 10000  # items accepted in one bulk request
+app.config['USERS_PAGE_SIZE'] = 100
+app.config['USERS_MAX_PAGE_SIZE'] = 1000
+app.config['PERMISSIONS_ENFORCED'] = False  # require the 'admin' role (X-User-Id header) for role changes
 db = SQLAlchemy(app)
+install_sqlite_pragmas(app, db)
 
 
 class Role(db.Model):
@@ -12,7 +27,9 @@ class Role(db.Model):
 
 user_roles = db.Table('user_roles',
     db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
-    db.Column('role_id', db.Integer, db.ForeignKey('role.id'), primary_key=True)
+    db.Column('role_id', db.Integer, db.ForeignKey('role.id'), primary_key=True),
+    # The primary key serves lookups by user; this serves "users with role X" in id order
+    db.Index('ix_user_roles_role_id_user_id', 'role_id', 'user_id')
 )
 
 
@@ -22,11 +39,35 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     roles = db.relationship('Role', secondary=user_roles, backref=db.backref('users', lazy='dynamic'))
 
-with app.app_context():
-    db.create_all()
- 
 
-    
+# JSON shapes, declared once per model
+user_json = Serializer('id', 'name', 'email')
+user_with_roles_json = Serializer('id', 'name', 'email', roles=lambda user: [role.name for role in user.roles])
+role_json = Serializer('id', 'name')
+
+
+permissions = RoleResolver(
+    load_user_role_ids=lambda user_id: db.session.scalars(
+        select(user_roles.c.role_id).where(user_roles.c.user_id == user_id)
+    ).all(),
+    load_role_ids_by_name=lambda: db.session.execute(select(Role.name, Role.id)).all(),
+)
+
+
+# Schema creation is kept out of import: run `flask --app mini_project init-db`
+# (or start the app with `python mini_project.py`, which calls it)
+def init_db():
+    with app.app_context():
+        db.create_all()
+        # create_all skips tables that already exist, so add new indexes explicitly
+        for index in user_roles.indexes:
+            index.create(db.engine, checkfirst=True)
+
+@app.cli.command('init-db')
+def init_db_command():
+    init_db()
+
+
 
 @app.route('/users', methods=['POST'])
 def create_user():
@@ -37,21 +78,154 @@ def create_user():
     return jsonify({"message": "User created", "id": new_user.id}), 201
 
 
+def insert_ignore(table):
+    """INSERT that skips rows violating a unique constraint (INSERT OR IGNORE)."""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with('IGNORE')
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def bulk_items(key):
+    """The list under `key` in the request body, or an error response."""
+    data = request.get_json(silent=True)
+    items = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({"error": f"'{key}' must be a non-empty list"}), 400)
+    if len(items) > app.config['BULK_MAX_ITEMS']:
+        return None, (jsonify({"error": f"At most {app.config['BULK_MAX_ITEMS']} items per request"}), 413)
+    return items, None
+
+
+@app.route('/users/bulk', methods=['POST'])
+def bulk_create_users():
+    users, error = bulk_items('users')
+    if error:
+        return error
+    invalid = [
+        index for index, user in enumerate(users)
+        if not isinstance(user, dict) or not isinstance(user.get('name'), str) or not isinstance(user.get('email'), str)
+    ]
+    if invalid:
+        return jsonify({"error": "Every user needs a name and an email", "invalid": invalid}), 400
+
+    created = []
+    for batch in chunks(users, app.config['BULK_BATCH_SIZE']):
+        # Emails that already exist (or repeat within the request) are skipped
+        rows = db.session.execute(
+            insert_ignore(User.__table__).returning(User.id, User.email),
+            [{"name": user['name'], "email": user['email']} for user in batch]
+        )
+        created.extend({"id": id, "email": email} for id, email in rows)
+    db.session.commit()
+    return jsonify({"created": created, "skipped": len(users) - len(created)}), 201
+
+
+@app.route('/users/roles/bulk', methods=['POST'])
+@permissions.require('admin')
+def bulk_assign_roles():
+    assignments, error = bulk_items('assignments')
+    if error:
+        return error
+    try:
+        pairs = [(int(item['user_id']), int(item['role_id'])) for item in assignments]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Every assignment needs an integer user_id and role_id"}), 400
+
+    assigned, invalid = 0, []
+    for batch in chunks(pairs, app.config['BULK_BATCH_SIZE']):
+        # Both id sets are checked in a single round trip per chunk
+        found = db.session.execute(
+            select(literal('user'), User.id).where(User.id.in_({user_id for user_id, _ in batch}))
+            .union_all(select(literal('role'), Role.id).where(Role.id.in_({role_id for _, role_id in batch})))
+        ).all()
+        user_ids = {id for kind, id in found if kind == 'user'}
+        role_ids = {id for kind, id in found if kind == 'role'}
+        valid = []
+        for user_id, role_id in batch:
+            if user_id in user_ids and role_id in role_ids:
+                valid.append({"user_id": user_id, "role_id": role_id})
+            else:
+                invalid.append({"user_id": user_id, "role_id": role_id})
+        if valid:
+            assigned += db.session.execute(insert_ignore(user_roles), valid).rowcount
+    db.session.commit()
+    permissions.invalidate_user(*{user_id for user_id, _ in pairs})
+    return jsonify({
+        "assigned": assigned,
+        "already_assigned": len(pairs) - assigned - len(invalid),
+        "invalid": invalid
+    })
+
+
+def users_page(role, after, limit):
+    """Up to `limit` users with ids above `after`, in id order, with their roles
+    loaded in one extra query; with `role`, only users holding that role."""
+    query = select(User).options(selectinload(User.roles))
+    key = User.id
+    if role is not None:
+        # Walk ix_user_roles_role_id_user_id, which is already in user id order
+        key = user_roles.c.user_id
+        query = query.join(user_roles, user_roles.c.user_id == User.id).where(
+            user_roles.c.role_id == select(Role.id).where(Role.name == role).scalar_subquery()
+        )
+    return db.session.scalars(query.where(key > after).order_by(key).limit(limit)).all()
+
+
+def stream_users(role, after, batch_size):
+    """A JSON array of every user after `after`, fetched one keyset batch at a time."""
+    yield '['
+    first = True
+    while True:
+        users = users_page(role, after, batch_size)
+        for user in users:
+            yield ('' if first else ',') + app.json.dumps(user_with_roles_json(user))
+            first = False
+        if len(users) < batch_size:
+            break
+        after = users[-1].id
+        # Batches are independent; let the session forget the previous one
+        db.session.expunge_all()
+    yield ']'
+
+
 @app.route("/users", methods=["GET"])
 def get_users():
-    try:
-        users = User.query.all()
-        return jsonify([{"id": user.id, "name": user.name, "email": user.email} for user in users])
-    except Exception as e:
-        print(f"Error retrieving users: {e}")
-        return jsonify({"error": "Internal Server Error"}), 500
+    """Users in id order, `limit` at a time. Pass the X-Next-Cursor value (also
+    in the Link header) as `after` for the next page; ?role=<name> keeps only
+    users with that role and ?stream=1 streams every matching user."""
+    after = request.args.get('after', 0, type=int)
+    limit = request.args.get('limit', app.config['USERS_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, app.config['USERS_MAX_PAGE_SIZE']))
+    role = request.args.get('role')
+
+    if request.args.get('stream') in ('1', 'true'):
+        return Response(
+            stream_with_context(stream_users(role, after, app.config['USERS_MAX_PAGE_SIZE'])),
+            mimetype='application/json'
+        )
+
+    users = users_page(role, after, limit)
+    response = jsonify(user_with_roles_json.many(users))
+    if len(users) == limit:
+        next_url = url_for('get_users', after=users[-1].id, limit=limit, role=role)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+        response.headers['X-Next-Cursor'] = str(users[-1].id)
+    return response
 
 
 @app.route("/users/<int:user_id>", methods = ["GET"])
 def get_user(user_id):
     user = User.query.get(user_id)                
     if user:
-        return jsonify({"id": user.id, "name": user.name, "email": user.email})  
+        return jsonify(user_json(user))
     return jsonify({"error": "User not found"}), 404
 
 
@@ -64,7 +238,7 @@ def update_user(user_id):
     user.name = data.get('name', user.name)
     user.email = data.get('email', user.email)
     db.session.commit()
-    return jsonify({"id": user.id, "name": user.name, "email": user.email})
+    return jsonify(user_json(user))
 
 @app.route('/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
@@ -73,30 +247,34 @@ def delete_user(user_id):
         return jsonify({"error": "User not found"}), 404
     db.session.delete(user)
     db.session.commit()
+    permissions.invalidate_user(user_id)
     return jsonify({"message": "User deleted"})
 
 @app.route('/roles', methods=['POST'])
+@permissions.require('admin')
 def create_role():
     data = request.json
     new_role = Role(name=data['name'])
     db.session.add(new_role)
     db.session.commit()
+    permissions.refresh_roles()
     return jsonify({"message": "Role created", "id": new_role.id}), 201
 
 @app.route('/roles', methods=['GET'])
 def get_roles():
     roles = Role.query.all()
-    return jsonify([{"id": role.id, "name": role.name} for role in roles])
+    return jsonify(role_json.many(roles))
 
 
 @app.route('/roles/<int:role_id>', methods=['GET'])
 def get_role(role_id):
     role = Role.query.get(role_id)
     if role:
-        return jsonify({"id": role.id, "name": role.name})
+        return jsonify(role_json(role))
     return jsonify({"error": "Role not found"}), 404
 
 @app.route('/roles/<int:role_id>', methods=['PUT'])
+@permissions.require('admin')
 def update_role(role_id):
     role = Role.query.get(role_id)
     if not role:
@@ -104,9 +282,11 @@ def update_role(role_id):
     data = request.json
     role.name = data.get('name', role.name)
     db.session.commit()
-    return jsonify({"id": role.id, "name": role.name})
+    permissions.bump()
+    return jsonify(role_json(role))
 
 @app.route('/users/<int:user_id>/roles', methods=['POST'])
+@permissions.require('admin')
 def assign_role_to_user(user_id):
     user = User.query.get(user_id)
     if not user:
@@ -116,9 +296,11 @@ def assign_role_to_user(user_id):
     if not role:
         return jsonify({"error": "Role not found"}), 404
     
-    if role not in user.roles:
-        user.roles.append(role)
-        db.session.commit()
+    # Insert the link directly instead of loading every role to test membership
+    inserted = db.session.execute(insert_ignore(user_roles), {"user_id": user.id, "role_id": role.id}).rowcount
+    db.session.commit()
+    permissions.invalidate_user(user.id)
+    if inserted:
         return jsonify({"message": "Role assigned to user"})
     return jsonify({"message": "User already has this role"})
 
@@ -131,13 +313,16 @@ def get_user_roles(user_id):
     
 
 @app.route('/roles/<int:role_id>', methods=['DELETE'])
+@permissions.require('admin')
 def delete_role(role_id):
     role = Role.query.get(role_id)
     if not role:
         return jsonify({"error": "Role not found"}), 404
     db.session.delete(role)
     db.session.commit()
+    permissions.bump()
     return jsonify({"message": "Role deleted"})
 
 if __name__ == '__main__':
+    init_db()
     app.run(debug=True)
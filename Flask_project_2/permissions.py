@@ -0,0 +1,125 @@
+"""Cached role checks for route authorization.
+
+A RoleResolver keeps each user's roles as an int bitmask (bit n set when the
+user has the role with id n) next to a name -> role id map, so a check is two
+dict lookups and a shift once the user has been seen:
+
+    resolver = RoleResolver(load_user_role_ids, load_role_ids_by_name)
+
+    @app.route('/roles', methods=['POST'])
+    @resolver.require('admin')
+    def create_role(): ...
+
+Invalidation is version based: invalidate_user(user_id) after changing one
+user's roles, refresh_roles() after creating a role, and bump() after a role
+is renamed or deleted, which retires every cached entry at once. The cache
+is per process, so masks and the name map also expire after `ttl` seconds:
+that bounds how long other workers act on a change they did not see. A name
+missing from the map triggers a reload (at most once a second), so a role
+created by another worker is usable there straight away.
+
+The X-User-Id header is taken on trust: any client can send an admin's id,
+so PERMISSIONS_ENFORCED guards against mistakes, not attackers.
+"""
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from flask import current_app, jsonify, request
+
+
+def user_id_from_header():
+    # The API has no authentication yet; callers identify themselves with X-User-Id
+    return request.headers.get('X-User-Id', type=int)
+
+
+class RoleResolver:
+    def __init__(self, load_user_role_ids, load_role_ids_by_name, current_user_id=user_id_from_header, max_users=100000, ttl=60):
+        self.load_user_role_ids = load_user_role_ids
+        self.load_role_ids_by_name = load_role_ids_by_name
+        self.current_user_id = current_user_id
+        self.max_users = max_users
+        self.ttl = ttl
+        self.version = 0
+        self._masks = OrderedDict()
+        self._role_ids = (-1, 0, {})  # (version, loaded at, name -> role id)
+        self._lock = Lock()
+        # Generation check for loads racing invalidate_user: user_id -> tick of
+        # its last invalidation, bounded like _masks; _forgotten is the newest
+        # tick dropped from it
+        self._ticks = 0
+        self._invalidated = OrderedDict()
+        self._forgotten = 0
+
+    def role_mask(self, user_id):
+        entry = self._masks.get(user_id)
+        if entry is not None and entry[0] == self.version and entry[2] > time.monotonic():
+            return entry[1]
+        version, tick = self.version, self._ticks
+        mask = 0
+        for role_id in self.load_user_role_ids(user_id):
+            mask |= 1 << role_id
+        with self._lock:
+            # Invalidated while loading: the mask may predate the change, so use it once but don't cache it
+            if self._invalidated.get(user_id, 0) <= tick and self._forgotten <= tick:
+                self._masks[user_id] = (version, mask, time.monotonic() + self.ttl)
+                self._masks.move_to_end(user_id)
+                while len(self._masks) > self.max_users:
+                    self._masks.popitem(last=False)
+        return mask
+
+    def role_ids(self, *names):
+        """name -> role id map, reloaded when stale or when one of `names` is missing."""
+        version, loaded_at, role_ids = self._role_ids
+        now = time.monotonic()
+        stale = version != self.version or loaded_at + self.ttl < now
+        missing = any(name not in role_ids for name in names) and loaded_at + 1 < now
+        if stale or missing:
+            version = self.version
+            role_ids = dict(self.load_role_ids_by_name())
+            self._role_ids = (version, now, role_ids)
+        return role_ids
+
+    def roles_of(self, user_id):
+        """frozenset of the user's role names."""
+        mask = self.role_mask(user_id)
+        return frozenset(name for name, role_id in self.role_ids().items() if mask >> role_id & 1)
+
+    def has_any_role(self, user_id, *names):
+        mask = self.role_mask(user_id)
+        role_ids = self.role_ids(*names)
+        return any(mask >> role_ids[name] & 1 for name in names if name in role_ids)
+
+    def invalidate_user(self, *user_ids):
+        with self._lock:
+            self._ticks += 1
+            for user_id in user_ids:
+                self._masks.pop(user_id, None)
+                self._invalidated[user_id] = self._ticks
+                self._invalidated.move_to_end(user_id)
+            while len(self._invalidated) > self.max_users:
+                self._forgotten = self._invalidated.popitem(last=False)[1]
+
+    def refresh_roles(self):
+        """Reload the name map (after a role is created) without touching user masks."""
+        self._role_ids = (-1, 0, {})
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+
+    def require(self, *names):
+        """Route decorator: 401 without a user id, 403 unless the user has one
+        of `names`. Only enforced when PERMISSIONS_ENFORCED is set."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if current_app.config.get('PERMISSIONS_ENFORCED'):
+                    user_id = self.current_user_id()
+                    if user_id is None:
+                        return jsonify({"error": "Authentication required"}), 401
+                    if not self.has_any_role(user_id, *names):
+                        return jsonify({"error": "Forbidden"}), 403
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
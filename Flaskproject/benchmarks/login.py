@@ -0,0 +1,75 @@
+"""Measure login throughput (requests per second) through the real login
+route, with the bcrypt pool sized for a given number of cores.
+
+    python benchmarks/login.py --cores 4 --clients 16 --rounds 12 --duration 10
+
+Each client thread posts the login form in a loop against a throwaway
+SQLite database. Logins rejected by the pool (503) are counted separately.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+DIRECTORY = tempfile.mkdtemp()
+os.environ['FLASKBLOG_DATABASE_URI'] = f'sqlite:///{os.path.join(DIRECTORY, "bench.db")}'
+
+from flaskblog import app, db, passwords  # noqa: E402
+from flaskblog.models import User  # noqa: E402
+
+EMAIL = 'bench@example.com'
+PASSWORD = 'benchmark-password'
+
+
+def client_loop(deadline, results):
+    client = app.test_client()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = client.post('/login', data={'email': EMAIL, 'password': PASSWORD})
+        status = response.status_code
+        client.get('/logout')
+        results.append((status, time.perf_counter() - start))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cores', type=int, default=os.cpu_count(), help='PASSWORD_HASH_WORKERS')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent client threads')
+    parser.add_argument('--rounds', type=int, default=12, help='BCRYPT_LOG_ROUNDS')
+    parser.add_argument('--backlog', type=int, default=16, help='PASSWORD_HASH_BACKLOG')
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    app.config.update(
+        WTF_CSRF_ENABLED=False,
+        BCRYPT_LOG_ROUNDS=args.rounds,
+        PASSWORD_HASH_WORKERS=args.cores,
+        PASSWORD_HASH_BACKLOG=args.backlog,
+    )
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username='bench', email=EMAIL, password=passwords.hash_password(PASSWORD)))
+        db.session.commit()
+
+    results = []
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=client_loop, args=(deadline, results)) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ok = sorted(latency for status, latency in results if status == 302)
+    rejected = sum(1 for status, _ in results if status == 503)
+    p50 = ok[len(ok) // 2] * 1000 if ok else float('nan')
+    p99 = ok[min(len(ok) - 1, int(len(ok) * 0.99))] * 1000 if ok else float('nan')
+    print(f'cores={args.cores} clients={args.clients} rounds={args.rounds} '
+          f'logins/s={len(ok) / args.duration:.1f} p50={p50:.1f}ms p99={p99:.1f}ms '
+          f'rejected={rejected} other={len(results) - len(ok) - rejected}')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,20 +3,42 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager
+from flaskblog.cache import page_cache
+from flaskblog.dbconfig import configure_database, install_sqlite_pragmas
+from flaskblog import uploads
+from flaskblog.usercache import user_cache
 
 app = Flask(__name__)
 
 app.config['SECRET_KEY'] = '8c64225882cf2ea01891ec74ffd2ec67'   #protect site from modifying cookies and cross site request forgery
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///site.db'
+configure_database(app, 'sqlite:///site.db', prefix='FLASKBLOG_')   #engine options and SQLite PRAGMAs from FLASKBLOG_* env vars
+app.config['POSTS_PER_PAGE'] = 5
+app.config['BCRYPT_LOG_ROUNDS'] = 12   #bcrypt work factor; existing hashes are upgraded on the next login
+app.config['PASSWORD_HASH_WORKERS'] = 4   #concurrent bcrypt hashes, roughly one per core
+app.config['PASSWORD_HASH_BACKLOG'] = 16   #hashes allowed to wait before logins get a 503
+app.config['PASSWORD_HASH_TIMEOUT'] = 10
+app.config['MAX_CONTENT_LENGTH'] = 8 * 1024 * 1024   #reject larger uploads with 413 before reading them
+app.config['QUERY_BUDGET_STRICT'] = None   #raise (True) or log (False) when a route exceeds its query budget; None follows debug/testing
 
 db = SQLAlchemy(app)
+install_sqlite_pragmas(app, db)
 bcrypt = Bcrypt(app)
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
+page_cache.init_app(app)
+uploads.init_app(app)
+user_cache.init_app(app)
 
 from flaskblog import models
 from flaskblog import routes
 
 def init_db():
     with app.app_context():  # Push an application context
-        db.create_all()
\ No newline at end of file
+        db.create_all()
+        # create_all skips tables that already exist, so add new indexes explicitly
+        for index in models.Post.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+
+@app.cli.command('init-db')
+def init_db_command():
+    init_db()
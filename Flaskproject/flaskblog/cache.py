@@ -0,0 +1,107 @@
+"""In-process cache of rendered pages, bounded by size with LRU eviction."""
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from flask import current_app, request, session
+
+
+class PageCache:
+    """Stores rendered HTML by key, evicting the least recently used pages
+    once PAGE_CACHE_MAX_BYTES is exceeded.
+
+    Keys are grouped into namespaces ('posts', 'post:<id>', ...) that carry a
+    version number; bump(namespace) invalidates every page in it at once and
+    the stale entries age out of the LRU.
+    """
+
+    def __init__(self, app=None):
+        self._pages = OrderedDict()
+        self._versions = {}
+        self._size = 0
+        self._lock = Lock()
+        self.max_bytes = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PAGE_CACHE_ENABLED', True)
+        app.config.setdefault('PAGE_CACHE_MAX_BYTES', 16 * 1024 * 1024)
+        self.max_bytes = app.config['PAGE_CACHE_MAX_BYTES']
+
+    def get(self, key):
+        with self._lock:
+            body = self._pages.get(key)
+            if body is not None:
+                self._pages.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._pages[key] = body
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._pages.popitem(last=False)
+                self._size -= len(evicted)
+
+    def version(self, namespace):
+        return self._versions.get(namespace, 0)
+
+    def bump(self, *namespaces):
+        with self._lock:
+            for namespace in namespaces:
+                self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self._versions.clear()
+            self._size = 0
+
+
+page_cache = PageCache()
+
+
+def request_variant():
+    """'auth' or 'anon' without loading the user from the database, or None
+    when the page must not come from the cache (pending flash messages, or a
+    remember-me cookie that has not been turned into a session yet)."""
+    if session.get('_flashes'):
+        return None
+    if session.get('_user_id'):
+        return 'auth'
+    if request.cookies.get(current_app.config.get('REMEMBER_COOKIE_NAME', 'remember_token')):
+        return None
+    return 'anon'
+
+
+def cached_page(namespace):
+    """Serve a GET view's rendered HTML from the page cache. `namespace` may
+    use the view's arguments, e.g. 'post:{post_id}'."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            variant = request_variant()
+            if not current_app.config['PAGE_CACHE_ENABLED'] or variant is None:
+                return view(**kwargs)
+            name = namespace.format(**kwargs)
+            key = (name, page_cache.version(name), request.full_path, variant)
+            body = page_cache.get(key)
+            if body is None:
+                body = view(**kwargs)
+                if not isinstance(body, str):
+                    return body
+                page_cache.set(key, body)
+            return body
+        return wrapper
+    return decorator
+
+
+def invalidate_post(post):
+    """Drop the cached pages that show `post`: its own page and every listing."""
+    page_cache.bump(f'post:{post.id}', 'posts')
@@ -0,0 +1,78 @@
+"""Database engine configuration read from the environment.
+
+configure_database(app, 'sqlite:///site.db', prefix='FLASKBLOG_') sets the
+URI and SQLAlchemy engine options from these variables (all optional):
+
+    <prefix>DATABASE_URI        database URI (default: the one passed in)
+    <prefix>DB_POOL_SIZE        connections kept open in the pool
+    <prefix>DB_MAX_OVERFLOW     extra connections allowed under load
+    <prefix>DB_POOL_TIMEOUT     seconds to wait for a free connection
+    <prefix>DB_POOL_RECYCLE     seconds before a connection is replaced
+    <prefix>DB_POOL_PRE_PING    test connections before use (default 1)
+    <prefix>DB_ECHO             log every statement (default 0)
+
+and, for SQLite, the PRAGMAs run on every new connection:
+
+    <prefix>SQLITE_JOURNAL_MODE   default WAL (readers no longer block the writer)
+    <prefix>SQLITE_SYNCHRONOUS    default NORMAL (safe with WAL, fsync at checkpoints)
+    <prefix>SQLITE_BUSY_TIMEOUT   default 5000 ms to wait for the write lock
+    <prefix>SQLITE_CACHE_SIZE     default -16000 (16 MB page cache)
+
+install_sqlite_pragmas(app, db) registers the connect event; call it once
+after SQLAlchemy(app).
+"""
+import os
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+POOL_OPTIONS = {
+    'DB_POOL_SIZE': ('pool_size', int),
+    'DB_MAX_OVERFLOW': ('max_overflow', int),
+    'DB_POOL_TIMEOUT': ('pool_timeout', float),
+    'DB_POOL_RECYCLE': ('pool_recycle', int),
+}
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': '5000',
+    'cache_size': '-16000',
+}
+
+
+def env_flag(name, default):
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes', 'on')
+
+
+def configure_database(app, default_uri, prefix):
+    uri = os.environ.get(f'{prefix}DATABASE_URI', default_uri)
+    options = {
+        'pool_pre_ping': env_flag(f'{prefix}DB_POOL_PRE_PING', '1'),
+        'echo': env_flag(f'{prefix}DB_ECHO', '0'),
+    }
+    # Pool sizing only applies to QueuePool, which in-memory SQLite does not use
+    for name, (option, cast) in POOL_OPTIONS.items():
+        value = os.environ.get(f'{prefix}{name}')
+        if value is not None:
+            options[option] = cast(value)
+
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    app.config['SQLITE_PRAGMAS'] = {
+        pragma: os.environ.get(f'{prefix}SQLITE_{pragma.upper()}', default)
+        for pragma, default in SQLITE_PRAGMAS.items()
+    }
+
+
+def install_sqlite_pragmas(app, db):
+    if make_url(app.config['SQLALCHEMY_DATABASE_URI']).get_backend_name() != 'sqlite':
+        return
+    pragmas = app.config['SQLITE_PRAGMAS']
+
+    with app.app_context():
+        @event.listens_for(db.engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma, value in pragmas.items():
+                cursor.execute(f'PRAGMA {pragma} = {value}')
+            cursor.close()
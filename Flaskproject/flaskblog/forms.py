@@ -1,9 +1,12 @@
 from flask_wtf import FlaskForm
-from wtforms import FileField
+from flask_wtf.file import FileField, FileAllowed
 
 from wtforms import StringField, PasswordField,SubmitField,BooleanField,TextAreaField
 from wtforms.validators import DataRequired,Length,Email,EqualTo,ValidationError
+from sqlalchemy import or_
+from flaskblog import db
 from flaskblog.models import User
+from flaskblog.uploads import ALLOWED_EXTENSIONS
 
 
 class RegistrationForm(FlaskForm):
@@ -11,19 +14,28 @@ class RegistrationForm(FlaskForm):
     email = StringField('Email', validators= [DataRequired(), Email()])
     password = PasswordField('Password', validators= [DataRequired()])
     confirm_password = PasswordField('Confirm password', validators=[DataRequired(), EqualTo('password')])
-    profile_image = FileField('Profile Image')
+    profile_image = FileField('Profile Image', validators=[FileAllowed(ALLOWED_EXTENSIONS, 'Images only')])
     submit = SubmitField('Sign up')
 
 
-    def validate_username(self, username):
-        user = User.query.filter_by(username=username.data).first()
-        if user:
-            raise ValidationError('That username is taken.Please choose a different username')
-        
-    def validate_email(self, email):
-        user = User.query.filter_by(email=email.data).first()
-        if user:
-            raise ValidationError('That email is taken.Please choose a different email')
+    def validate(self, extra_validators=None):
+        valid = super().validate(extra_validators)
+        # One query over both unique indexes instead of one per field, run
+        # whatever the other fields did so every error shows at once
+        checked = [field for field in (self.username, self.email) if not field.errors]
+        if not checked:
+            return False
+        columns = {self.username: User.username, self.email: User.email}
+        taken = db.session.execute(
+            db.select(User.username, User.email)
+            .where(or_(*(columns[field] == field.data for field in checked)))
+        ).all()
+        for username, email in taken:
+            if self.username in checked and username == self.username.data:
+                self.username.errors.append('That username is taken.Please choose a different username')
+            if self.email in checked and email == self.email.data:
+                self.email.errors.append('That email is taken.Please choose a different email')
+        return valid and not taken
 
 
 class LoginForm(FlaskForm):
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 import pytz
-from flaskblog import db, login_manager
+from flaskblog import db, login_manager, usercache
 from flask_login import UserMixin
 
 
@@ -8,13 +8,20 @@ ist = pytz.timezone('Asia/Kolkata')
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    fields = usercache.cached_fields(user_id)
+    if fields is not None:
+        return usercache.hydrate(db.session, User, fields)
+    user = db.session.get(User, user_id)
+    if user is not None:
+        usercache.user_cache.set(user_id, usercache.snapshot(user))
+    return user
 
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(20), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    image_file = db.Column(db.String(20), nullable=False, default='images.jpg')
+    image_file = db.Column(db.String(64), nullable=False, default='images.jpg')
     password = db.Column(db.String(60), nullable=False)
     posts = db.relationship('Post', backref='author', lazy=True)
 
@@ -22,7 +29,16 @@ class User(db.Model, UserMixin):
         return f"User('{self.username}', '{self.email}', '{self.image_file}')"
 
 
+usercache.watch(User)
+
+
 class Post(db.Model):
+    # Listings are ordered newest first, globally and per author
+    __table_args__ = (
+        db.Index('ix_post_date_posted', 'date_posted'),
+        db.Index('ix_post_user_id_date_posted', 'user_id', 'date_posted'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     date_posted = db.Column(db.DateTime, nullable=False, default=db.func.now())
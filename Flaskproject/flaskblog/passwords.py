@@ -0,0 +1,86 @@
+"""Password hashing on a bounded thread pool, so bcrypt never runs on more
+threads than there are cores and bursts of logins fail fast with 503."""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+from flaskblog import bcrypt
+
+
+class HashingPool:
+    """At most `workers` hashes run at once and at most `backlog` more may
+    wait; anything beyond that raises ServiceUnavailable instead of piling
+    more CPU-bound work onto the request threads."""
+
+    def __init__(self, workers, backlog, timeout):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + backlog)
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailable('Too many logins in progress, please retry shortly.', retry_after=1)
+        try:
+            future = self._executor.submit(self._job, func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            if future.cancel():  # never started, so _job will not release the slot
+                self._slots.release()
+            raise ServiceUnavailable('Too many logins in progress, please retry shortly.', retry_after=1)
+
+    def _job(self, func, *args):
+        # The slot is held until the hash finishes, not just while the request waits for it
+        try:
+            return func(*args)
+        finally:
+            self._slots.release()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+# Checked against when the email is unknown, so response times do not reveal which emails exist
+_dummy_hash = None
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    workers=current_app.config['PASSWORD_HASH_WORKERS'],
+                    backlog=current_app.config['PASSWORD_HASH_BACKLOG'],
+                    timeout=current_app.config['PASSWORD_HASH_TIMEOUT'],
+                )
+    return _pool
+
+
+def hash_password(password):
+    """bcrypt hash of `password` at BCRYPT_LOG_ROUNDS, as a str."""
+    rounds = current_app.config['BCRYPT_LOG_ROUNDS']
+    return get_pool().run(bcrypt.generate_password_hash, password, rounds).decode('utf-8')
+
+
+def check_password(user, password):
+    """Verify `password` for `user` (which may be None) in the pool. Hashes
+    made with fewer rounds than configured are upgraded on success."""
+    global _dummy_hash
+    if user is None:
+        if _dummy_hash is None:
+            _dummy_hash = hash_password('dummy password')
+        get_pool().run(bcrypt.check_password_hash, _dummy_hash, password)
+        return False
+    if not get_pool().run(bcrypt.check_password_hash, user.password, password):
+        return False
+    if hash_rounds(user.password) < current_app.config['BCRYPT_LOG_ROUNDS']:
+        user.password = hash_password(password)
+    return True
+
+
+def hash_rounds(hashed):
+    # bcrypt hashes look like $2b$12$<salt and hash>
+    return int(hashed.split('$')[2])
@@ -0,0 +1,36 @@
+"""Per-request SQL query counting and query budgets for routes."""
+from functools import wraps
+from flask import current_app, g, has_app_context
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+
+def query_budget(budget):
+    """Fail the request (in debug/testing) or log a warning (in production)
+    when the view runs more than `budget` queries. Loading the logged-in user
+    is allowed one extra query on top of the budget."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            start = g.get('query_count', 0)
+            response = view(*args, **kwargs)
+            allowed = budget + (1 if current_user.is_authenticated else 0)
+            used = g.get('query_count', 0) - start
+            if used > allowed:
+                message = f'{view.__name__} ran {used} queries (budget {allowed})'
+                strict = current_app.config['QUERY_BUDGET_STRICT']
+                if strict is None:
+                    strict = current_app.debug or current_app.testing
+                if strict:
+                    raise AssertionError(message)
+                current_app.logger.warning(message)
+            return response
+        return wrapper
+    return decorator
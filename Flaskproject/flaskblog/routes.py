@@ -1,18 +1,38 @@
 from flask import render_template, url_for, flash, redirect, request
-from flaskblog import app, db, bcrypt
+from flaskblog import app, db, uploads, usercache
+from flaskblog.passwords import check_password, hash_password
 from flaskblog.forms import RegistrationForm, LoginForm, PostForm
 from flaskblog.models import User, Post
+from flaskblog.cache import cached_page, invalidate_post
+from flaskblog.querycount import query_budget
 from flask_login import login_user, current_user, logout_user, login_required
-from werkzeug.utils import secure_filename
-import os
+from sqlalchemy.orm import joinedload
+
+
+def paginate_posts(query):
+    # One COUNT query plus one page query; authors come in the same JOIN
+    query = query.options(joinedload(Post.author)).order_by(Post.date_posted.desc(), Post.id.desc())
+    page = request.args.get('page', 1, type=int)
+    return db.paginate(query, page=page, per_page=app.config['POSTS_PER_PAGE'])
 
 @app.route("/")
 @app.route("/home")
+@cached_page('posts')
+@query_budget(2)
 def home():
-    posts = Post.query.all()
+    posts = paginate_posts(db.select(Post))
     return render_template('home.html', posts=posts)
 
+@app.route("/user/<string:username>")
+@cached_page('posts')
+@query_budget(3)
+def user_posts(username):
+    user = db.first_or_404(db.select(User).filter_by(username=username))
+    posts = paginate_posts(db.select(Post).filter_by(author=user))
+    return render_template('user_posts.html', posts=posts, user=user)
+
 @app.route("/about")
+@cached_page('about')
 def about():
     return render_template('about.html', title='about')
 
@@ -22,15 +42,15 @@ def register():
         return redirect(url_for('home'))
     form = RegistrationForm()
     if form.validate_on_submit():
-        hashed_password = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+        hashed_password = hash_password(form.password.data)
         user = User(username=form.username.data, email=form.email.data, password=hashed_password)
         if form.profile_image.data:
-            # Save the uploaded image
-            image_file = secure_filename(form.profile_image.data.filename)
-            form.profile_image.data.save(os.path.join(app.root_path, 'static/image', image_file))
-            user.image_file = image_file
+            # Stored under a content-hash name; thumbnails are made in the background
+            user.image_file = uploads.save_upload(form.profile_image.data)
         db.session.add(user)
         db.session.commit()
+        if form.profile_image.data:
+            uploads.schedule_thumbnails(user.image_file)
         flash(f'Your account has been created! You are now able to log in', 'success')
         return redirect(url_for('login'))
     return render_template('register.html', title='Register', form=form)
@@ -42,8 +62,10 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data).first()
-        if user and bcrypt.check_password_hash(user.password, form.password.data):
+        if check_password(user, form.password.data):
+            db.session.commit()   #saves the upgraded hash, if any
             login_user(user, remember=form.remember.data)
+            usercache.remember(user)
             return redirect(url_for('home'))
         else:
             flash('login unsuccessful, please check your email and password', 'danger')
@@ -52,12 +74,13 @@ def login():
 @app.route("/logout")
 def logout():
     logout_user()
+    usercache.forget_in_session()
     return redirect(url_for('home'))
 
 @app.route("/account")
 @login_required
 def account():
-    image_file = url_for('static', filename='image/' + (current_user.image_file if current_user.image_file else 'images.jpg'))
+    image_file = uploads.image_url(current_user.image_file or 'images.jpg', 'large')
     return render_template('account.html', title='Account', image_file=image_file)
 
 @app.route("/post/new", methods=['GET', 'POST'])
@@ -68,11 +91,13 @@ def new_post():
         post = Post(title=form.title.data, content=form.content.data, author=current_user)
         db.session.add(post)
         db.session.commit()
+        invalidate_post(post)
         flash('Your post has been created!', 'success')
         return redirect(url_for('home'))
     return render_template('create_post.html', title='New Post', form=form)
 
 @app.route("/post/<int:post_id>")
+@cached_page('post:{post_id}')
 def post(post_id):
     post = Post.query.get_or_404(post_id)
     return render_template('post.html', title=post.title, post=post)
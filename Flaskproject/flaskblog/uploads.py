@@ -0,0 +1,114 @@
+"""Profile image uploads: content-addressed storage, background thumbnails
+and long-lived cache headers."""
+import hashlib
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, send_from_directory, url_for
+from werkzeug.utils import secure_filename
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # thumbnails are skipped and the original is served
+    Image = None
+
+ALLOWED_EXTENSIONS = ('jpg', 'jpeg', 'png', 'gif', 'webp')  # checked by the upload form fields
+CHUNK_SIZE = 64 * 1024
+# Uploaded files are named after their content, so they never change
+HASHED_NAME = re.compile(r'^[0-9a-f]{32}(_\w+)?\.\w+$')
+
+_executor = None
+
+
+def init_app(app):
+    app.config.setdefault('UPLOAD_FOLDER', os.path.join(app.root_path, 'static', 'image'))
+    app.config.setdefault('THUMBNAIL_SIZES', {'small': 64, 'large': 250})
+    app.config.setdefault('THUMBNAIL_WORKERS', 2)
+    app.config.setdefault('MEDIA_MAX_AGE', 365 * 24 * 60 * 60)
+    app.add_url_rule('/media/<path:filename>', 'media', media)
+    app.add_template_global(image_url)
+
+
+def extension(filename):
+    ext = secure_filename(filename).rsplit('.', 1)[-1].lower()
+    return 'jpg' if ext == 'jpeg' else ext
+
+
+def save_upload(file):
+    """Copy an uploaded file to UPLOAD_FOLDER in chunks, hashing as it goes,
+    and return its content-hash name. Identical uploads share one file."""
+    folder = current_app.config['UPLOAD_FOLDER']
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                out.write(chunk)
+        filename = f'{digest.hexdigest()[:32]}.{extension(file.filename)}'
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return filename
+
+
+def thumbnail_name(filename, size_name):
+    stem, ext = filename.rsplit('.', 1)
+    return f'{stem}_{size_name}.{ext}'
+
+
+def schedule_thumbnails(filename):
+    """Resize a saved upload to every THUMBNAIL_SIZES entry on the worker pool."""
+    global _executor
+    if Image is None:
+        return None
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=current_app.config['THUMBNAIL_WORKERS'], thread_name_prefix='thumbnails'
+        )
+    return _executor.submit(
+        make_thumbnails, current_app.config['UPLOAD_FOLDER'], filename,
+        current_app.config['THUMBNAIL_SIZES'], current_app.logger
+    )
+
+
+def make_thumbnails(folder, filename, sizes, logger):
+    try:
+        with Image.open(os.path.join(folder, filename)) as image:
+            image_format = image.format
+            image = ImageOps.exif_transpose(image)
+            for size_name, size in sizes.items():
+                thumbnail = image.copy()
+                thumbnail.thumbnail((size, size))
+                path = os.path.join(folder, thumbnail_name(filename, size_name))
+                # Write then rename so a request never sees a half-written file
+                tmp_path = f'{path}.part'
+                thumbnail.save(tmp_path, format=image_format)
+                os.replace(tmp_path, path)
+    except Exception:
+        logger.exception('Could not create thumbnails for %s', filename)
+
+
+def image_url(filename, size_name=None):
+    """URL of a profile image's thumbnail, or of the original until the
+    thumbnail exists (or for images that were never processed)."""
+    if size_name and HASHED_NAME.match(filename):
+        thumbnail = thumbnail_name(filename, size_name)
+        if os.path.exists(os.path.join(current_app.config['UPLOAD_FOLDER'], thumbnail)):
+            filename = thumbnail
+    return url_for('media', filename=filename)
+
+
+def media(filename):
+    max_age = current_app.config['MEDIA_MAX_AGE'] if HASHED_NAME.match(filename) else None
+    response = send_from_directory(current_app.config['UPLOAD_FOLDER'], filename, max_age=max_age)
+    if max_age:
+        response.cache_control.immutable = True
+    return response
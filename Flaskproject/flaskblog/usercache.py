@@ -0,0 +1,126 @@
+"""Cache for flask-login's user loader.
+
+flask-login already calls the loader at most once per request (the result
+is kept on `g`); this adds a process-wide cache of user column values with a
+short TTL, and optionally a copy in the signed session cookie. Cached
+values are turned back into a session-bound User with merge(load=False),
+which needs no query; anything not cached (the password hash, relationships)
+still loads on first access.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from flask import current_app, session
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+# Never put the password hash in the cache or the (readable) session cookie
+USER_FIELDS = ('id', 'username', 'email', 'image_file')
+SESSION_KEY = '_user_snapshot'
+
+
+class UserCache:
+    def __init__(self, app=None):
+        self._users = OrderedDict()
+        # user_id -> time of the last change, oldest first; kept only as long
+        # as a session copy from before the change could still be used
+        self._invalidated = OrderedDict()
+        self._lock = Lock()
+        self.ttl = 0
+        self.max_size = 0
+        self.session_max_age = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('USER_CACHE_TTL', 60)
+        app.config.setdefault('USER_CACHE_SIZE', 10000)
+        app.config.setdefault('USER_SESSION_HYDRATION', False)
+        app.config.setdefault('USER_SESSION_MAX_AGE', 24 * 60 * 60)
+        self.ttl = app.config['USER_CACHE_TTL']
+        self.max_size = app.config['USER_CACHE_SIZE']
+        self.session_max_age = app.config['USER_SESSION_MAX_AGE']
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            expires, fields = entry
+            if expires < time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+            return fields
+
+    def set(self, user_id, fields):
+        with self._lock:
+            self._users[user_id] = (time.monotonic() + self.ttl, fields)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_size:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        now = time.time()
+        with self._lock:
+            self._users.pop(user_id, None)
+            self._invalidated[user_id] = now
+            self._invalidated.move_to_end(user_id)
+            while next(iter(self._invalidated.values())) < now - self.session_max_age:
+                self._invalidated.popitem(last=False)
+
+    def changed_since(self, user_id, timestamp):
+        """Whether a copy stored at `timestamp` may be stale. Copies older
+        than USER_SESSION_MAX_AGE always are, as their invalidation may have
+        been pruned."""
+        if timestamp < time.time() - self.session_max_age:
+            return True
+        return self._invalidated.get(user_id, 0) >= timestamp
+
+
+user_cache = UserCache()
+
+
+def snapshot(user):
+    return {field: getattr(user, field) for field in USER_FIELDS}
+
+
+def cached_fields(user_id):
+    """Column values for `user_id` from the session copy (when
+    USER_SESSION_HYDRATION is on) or the process cache, else None."""
+    if current_app.config['USER_SESSION_HYDRATION']:
+        stored = session.get(SESSION_KEY)
+        if stored and stored['id'] == user_id and not user_cache.changed_since(user_id, stored['stored_at']):
+            return {field: stored[field] for field in USER_FIELDS}
+    return user_cache.get(user_id)
+
+
+def hydrate(db_session, model, fields):
+    """Session-bound instance built from cached column values, without a query."""
+    instance = model(**fields)
+    make_transient_to_detached(instance)
+    return db_session.merge(instance, load=False)
+
+
+def remember(user):
+    """Prime the process cache, and the session copy when USER_SESSION_HYDRATION
+    is on: the cookie is signed but readable, so it only carries the user's
+    columns when that is asked for."""
+    fields = snapshot(user)
+    user_cache.set(user.id, fields)
+    if current_app.config['USER_SESSION_HYDRATION']:
+        session[SESSION_KEY] = dict(fields, stored_at=time.time())
+    else:
+        forget_in_session()  # drops a copy written while hydration was on
+
+
+def forget_in_session():
+    session.pop(SESSION_KEY, None)
+
+
+def watch(model):
+    """Drop cached copies whenever a user row is updated or deleted."""
+    @event.listens_for(model, 'after_update')
+    @event.listens_for(model, 'after_delete')
+    def invalidate_cached_user(mapper, connection, target):
+        user_cache.invalidate(target.id)